@@ -1,4 +1,5 @@
 """Bot manager: register/start/stop module worker threads."""
+from concurrent.futures import Future, ThreadPoolExecutor
 from threading import Thread, Event
 from typing import Callable, Dict, Optional
 import inspect
@@ -7,15 +8,18 @@ import time
 
 class BotManager:
     def __init__(self) -> None:
-        # store per-module info: { name: { target, log_func, thread, stop_event } }
+        # store per-module info: { name: { target, params, log_func, thread, stop_event, finished_event } }
         self._modules: Dict[str, Dict] = {}
-        # track last completion timestamp per module for cooldown checking
-        self._last_completed: Dict[str, float] = {}
-        # cooldown durations per module (in seconds)
-        self._cooldowns: Dict[str, float] = {
-            'arena': 15 * 60,  # 15 minutes for arena
-            'tag_arena': 24 * 3600,  # 24 hours for tag arena
+        # track last completion time per module (time.monotonic_ns) for cooldown checking;
+        # monotonic so wall-clock adjustments can't shorten or extend a cooldown
+        self._last_completed: Dict[str, int] = {}
+        # cooldown durations per module (in nanoseconds)
+        self._cooldowns: Dict[str, int] = {
+            'arena': 15 * 60 * 10**9,  # 15 minutes for arena
+            'tag_arena': 24 * 3600 * 10**9,  # 24 hours for tag arena
         }
+        # single reusable worker for module sequences, so Start doesn't create a thread each time
+        self._seq_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='seq')
 
     def register_module(self, name: str, target: Callable, log_func: Optional[Callable[[str], None]] = None) -> None:
         """Register a module target without creating the thread yet.
@@ -24,11 +28,17 @@ class BotManager:
         """
         if name in self._modules:
             raise ValueError(f"Module '{name}' already registered")
+        # events are reused across restarts; finished starts set since nothing is running
+        finished_event = Event()
+        finished_event.set()
         self._modules[name] = {
             'target': target,
+            # resolve the target's arity once; inspect.signature is too costly to repeat per start
+            'params': len(inspect.signature(target).parameters),
             'log_func': log_func,
             'thread': None,
-            'stop_event': None,
+            'stop_event': Event(),
+            'finished_event': finished_event,
         }
 
     def start_module(self, name: str) -> None:
@@ -38,13 +48,14 @@ class BotManager:
         if thread is not None and thread.is_alive():
             return
 
-        # create fresh stop event and thread wrapper
-        stop_event = Event()
+        # reset the module's reusable events and create the thread wrapper
+        stop_event = info['stop_event']
+        finished_event = info['finished_event']
+        stop_event.clear()
+        finished_event.clear()
         target = info['target']
         log_func = info.get('log_func')
-
-        sig = inspect.signature(target)
-        params = len(sig.parameters)
+        params = info['params']
 
         def _runner():
             try:
@@ -58,10 +69,12 @@ class BotManager:
                         log_func(f"[module:{name}] exception: {exc}")
                     except Exception:
                         pass
+            finally:
+                # wake anyone waiting on this module (e.g. the sequence controller)
+                finished_event.set()
 
         new_thread = Thread(target=_runner, name=name, daemon=True)
         info['thread'] = new_thread
-        info['stop_event'] = stop_event
         new_thread.start()
 
     def stop_module(self, name: str, timeout: float = 5.0) -> None:
@@ -69,23 +82,33 @@ class BotManager:
         if not info:
             return
         thread = info.get('thread')
-        stop_event = info.get('stop_event')
-        if stop_event is not None:
-            stop_event.set()
+        info['stop_event'].set()
         if thread is not None:
             thread.join(timeout=timeout)
-        # clear thread reference so it can be started again later
-        info['thread'] = None
-        info['stop_event'] = None
+        # release waiters even if the worker ignored the stop request within `timeout`
+        info['finished_event'].set()
+        # clear thread reference so it can be started again later; a worker that is still
+        # alive keeps its reference so a restart can't clear() the event it is watching
+        if thread is None or not thread.is_alive():
+            info['thread'] = None
 
     def start_all(self) -> None:
-        for name in list(self._modules.keys()):
+        for name in self._modules:
             self.start_module(name)
 
     def stop_all(self) -> None:
-        for name in list(self._modules.keys()):
+        # snapshot: the sequence worker may register modules while the GUI thread stops them
+        for name in tuple(self._modules):
             self.stop_module(name)
 
+    def submit_sequence(self, fn: Callable, *args, **kwargs) -> Future:
+        """Run `fn(*args, **kwargs)` on the sequence worker; queued behind any sequence still running."""
+        return self._seq_pool.submit(fn, *args, **kwargs)
+
+    def shutdown(self) -> None:
+        """Release the sequence worker; call once the manager is no longer needed."""
+        self._seq_pool.shutdown(wait=False)
+
     def is_registered(self, name: str) -> bool:
         return name in self._modules
 
@@ -96,9 +119,19 @@ class BotManager:
         thread = info.get('thread')
         return thread is not None and thread.is_alive()
 
+    def wait_module(self, name: str, timeout: Optional[float] = None) -> bool:
+        """Block until module `name` finishes (or is stopped). Returns True if it finished.
+
+        Returns True immediately if the module is unknown or not started.
+        """
+        info = self._modules.get(name)
+        if not info:
+            return True
+        return info['finished_event'].wait(timeout)
+
     def mark_completed(self, name: str) -> None:
-        """Mark a module as completed; stores current timestamp for cooldown tracking."""
-        self._last_completed[name] = time.time()
+        """Mark a module as completed; stores current monotonic time for cooldown tracking."""
+        self._last_completed[name] = time.monotonic_ns()
 
     def get_cooldown_remaining(self, name: str) -> float:
         """Return seconds remaining until module can run again, or 0.0 if ready.
@@ -106,17 +139,16 @@ class BotManager:
         Returns 0.0 if module has no cooldown or cooldown has elapsed.
         Returns positive value (seconds) if module is still on cooldown.
         """
-        cooldown_duration = self._cooldowns.get(name, 0)
-        if cooldown_duration <= 0:
+        cooldown_ns = self._cooldowns.get(name, 0)
+        if cooldown_ns <= 0:
             return 0.0
         
-        last_time = self._last_completed.get(name)
-        if last_time is None:
+        last_ns = self._last_completed.get(name)
+        if last_ns is None:
             return 0.0  # never run, so not on cooldown
         
-        elapsed = time.time() - last_time
-        remaining = cooldown_duration - elapsed
-        return max(0.0, remaining)
+        remaining_ns = cooldown_ns - (time.monotonic_ns() - last_ns)
+        return max(0, remaining_ns) / 1e9
 
 
 if __name__ == "__main__":
@@ -1,7 +1,10 @@
 import FreeSimpleGUI as sg  # Changed from PySimpleGUI
+import heapq
 import threading
 import os
 import time
+import io
+from collections import deque
 from bot_manager import BotManager
 from modules.campaign import campaign_loop
 from modules.arena import arena_loop
@@ -9,23 +12,70 @@ from modules.tag_arena import tag_arena_loop
 from utils.window import ensure_game_window
 from utils.popup import close_popup_if_present
 
+try:
+    from PIL import Image
+except Exception:  # pragma: no cover - optional dependency
+    Image = None
+
+THUMB_SIZE = (200, 150)
+
+# Map some actions to manager-controlled modules: display name -> (internal name, target)
+ACTION_MAP = {
+    'Farm Campaign': ('campaign', campaign_loop),
+    'Arena': ('arena', arena_loop),
+    'Tag Arena': ('tag_arena', tag_arena_loop),
+}
+
+
+class LogQueue:
+    """Collects log lines from worker threads and wakes the GUI once per batch.
+
+    `put` only posts a `-THREAD_LOG-` event when no flush is already pending, so a
+    burst of messages costs a single GUI wakeup; the GUI thread calls `drain`.
+    """
+
+    def __init__(self, window):
+        self._window = window
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._pending = False
+
+    def put(self, message):
+        with self._lock:
+            self._items.append(message)
+            if self._pending:
+                return
+            self._pending = True
+        self._window.write_event_value('-THREAD_LOG-', None)
+
+    def drain(self):
+        with self._lock:
+            self._pending = False
+            batch = list(self._items)
+            self._items.clear()
+        return batch
+
+
 class BotThread(threading.Thread):
-    def __init__(self, window, action, interval):
+    def __init__(self, window, action, interval, log_func=None):
         super().__init__(daemon=True)
         self.window = window
         self.action = action
         self.interval = interval
+        self.log_func = log_func
         self._stop_event = threading.Event()
 
     def run(self):
         self._log(f"Bot started: action={self.action}, interval={self.interval}s")
-        while not self._stop_event.is_set():
-            self.perform_action()
-            # Sleeping in small increments allows for a faster stop response
-            for _ in range(max(1, int(self.interval * 10))):
-                if self._stop_event.is_set():
-                    break
-                time.sleep(0.1)
+        # bind hot-loop lookups to locals
+        stop_wait = self._stop_event.wait
+        perform = self.perform_action
+        interval = max(0.1, self.interval)
+        while not stop_wait(timeout=0):
+            perform()
+            # Waiting on the stop event returns immediately when stop() is called
+            if stop_wait(timeout=interval):
+                break
         self._log("Bot stopped")
 
     def stop(self):
@@ -37,8 +87,120 @@ class BotThread(threading.Thread):
         time.sleep(0.5)
 
     def _log(self, message):
-        # Sends event to the GUI thread to safely update the window
-        self.window.write_event_value('-THREAD_LOG-', message)
+        # Sends the message to the GUI thread to safely update the window
+        if self.log_func:
+            self.log_func(message)
+        else:
+            self.window.write_event_value('-THREAD_LOG-', message)
+
+
+# directories that never contain templates; pruned from repo searches
+_PRUNE_DIRS = {'.git', '__pycache__', 'venv', '.venv', 'node_modules', '.mypy_cache', '.pytest_cache'}
+
+
+def _find_close_ad_template():
+    """Search the repo for CloseAd.png; returns its path or None."""
+    root = os.path.abspath(os.path.dirname(__file__))
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in _PRUNE_DIRS and not d.startswith('.')]
+        if 'CloseAd.png' in filenames:
+            return os.path.join(dirpath, 'CloseAd.png')
+    return None
+
+
+def _load_thumbnail(path, cache):
+    """Return PNG bytes for the preview of `path`, scaled to THUMB_SIZE when PIL is available.
+
+    `cache` maps path -> (mtime, data) so an unchanged file is only read and decoded once.
+    """
+    mtime = os.path.getmtime(path)
+    cached = cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    if Image is not None:
+        with Image.open(path) as img:
+            img.thumbnail(THUMB_SIZE)
+            buf = io.BytesIO()
+            img.save(buf, format='PNG')
+            data = buf.getvalue()
+    else:
+        with open(path, 'rb') as f:
+            data = f.read()
+    cache[path] = (mtime, data)
+    return data
+
+
+def _prepare_window(log, tpl_path=None, close_path=None):
+    """Close any popup, ensure window positioning, then close popups again."""
+    try:
+        if close_path:
+            close_popup_if_present(log=log, templates=[close_path])
+    except Exception:
+        pass
+    try:
+        if tpl_path:
+            ensure_game_window(log=log, template_path=tpl_path)
+        else:
+            ensure_game_window(log=log)
+    except Exception:
+        pass
+    try:
+        if close_path:
+            close_popup_if_present(log=log, templates=[close_path])
+    except Exception:
+        pass
+
+
+def run_sequence(mgr, modules, win, log, stop_event, tpl_path=None, close_path=None):
+    """Run `modules` repeatedly, preparing the game window before each, until `stop_event` is set.
+
+    Modules are kept in a min-heap keyed by the time they come off cooldown, so the
+    next ready module always runs first (selection order breaks ties) and the
+    controller sleeps exactly until the head of the heap is ready.
+    Submitted to the manager's sequence pool.
+    """
+    # heap entries: (ready_at, position, name, target); ready_at is in time.monotonic() seconds
+    now = time.monotonic()
+    heap = [(now + mgr.get_cooldown_remaining(name), i, name, target) for i, (name, target) in enumerate(modules)]
+    heapq.heapify(heap)
+    while heap and not stop_event.is_set():
+        ready_at, pos, name, target = heap[0]
+        delay = ready_at - time.monotonic()
+        if delay > 0:
+            # head of the heap is on cooldown, so every module is: sleep until it is ready
+            mins, secs = divmod(int(delay), 60)
+            log(f"[sequence] {name} is on cooldown for {mins}m {secs}s; waiting for next ready module")
+            stop_event.wait(delay)
+            continue
+
+        # prepare window before each module
+        _prepare_window(log, tpl_path, close_path)
+        if stop_event.is_set():
+            # Stop pressed while the window was being prepared (retries can take seconds)
+            break
+        try:
+            if not mgr.is_registered(name):
+                mgr.register_module(name, target, log_func=log)
+        except Exception:
+            pass
+        win.write_event_value('-MODULE_STARTED-', name)
+        mgr.start_module(name)
+        if stop_event.is_set():
+            # stop was requested while starting; make sure the new worker is told to exit
+            mgr.stop_module(name)
+        # blocks until the worker exits; stopping the module also releases it
+        mgr.wait_module(name)
+        try:
+            mgr.stop_module(name)
+            # Mark module as completed for cooldown tracking, unless Stop cut it short
+            if not stop_event.is_set():
+                mgr.mark_completed(name)
+        except Exception:
+            pass
+        win.write_event_value('-MODULE_ENDED-', name)
+        # requeue with its fresh cooldown
+        heapq.heapreplace(heap, (time.monotonic() + mgr.get_cooldown_remaining(name), pos, name, target))
+    win.write_event_value('-SEQUENCE_DONE-', True)
 
 
 def main():
@@ -74,7 +236,7 @@ def main():
         ],
         [sg.Button('Test Close', key='-TEST-CLOSE-')],
         [sg.Text('Template Preview (Close-Button):')],
-        [sg.Image(key='-TEMPLATE-THUMB-', size=(200, 150))]
+        [sg.Image(key='-TEMPLATE-THUMB-', size=THUMB_SIZE)]
     ]
 
     layout = [
@@ -83,16 +245,26 @@ def main():
     ]
 
     window = sg.Window('RSL Bot GUI', layout, finalize=True)
+    # worker threads log through this queue; -THREAD_LOG- events just signal a batch is waiting
+    log_queue = LogQueue(window)
+    module_log = log_queue.put
     bot = None
     manager = BotManager()
     current_module_name = None
     start_time = None
     running = False
     controller_ref = None
+    seq_stop = None
+    thumb_cache = {}
+    last_ts = [0, '']  # [epoch second, formatted timestamp] for log lines
+    # fallback close-button template; its location doesn't change at runtime so search once
+    default_close_tpl = _find_close_ad_template()
 
-    # use a short timeout so we can update the runtime timer
     while True:
-        event, values = window.read(timeout=200)
+        # block until an event arrives when idle; tick once a second to refresh the runtime timer
+        event, values = window.read(timeout=1000 if running else None)
+        # values is a dict for normal events and None when the window closes
+        vals = values if isinstance(values, dict) else {}
         
         if event in (sg.WINDOW_CLOSED, 'Exit'):
             if bot:
@@ -102,107 +274,78 @@ def main():
                     manager.stop_module(current_module_name)
                 except Exception:
                     pass
+            if seq_stop:
+                seq_stop.set()
             manager.stop_all()
+            manager.shutdown()
             break
 
         # update thumbnail preview when close template changes
-        if event == '-TEMPLATE-CLOSE-' and isinstance(values, dict):
-            tpl_path = values.get('-TEMPLATE-CLOSE-')
+        if event == '-TEMPLATE-CLOSE-':
+            tpl_path = vals.get('-TEMPLATE-CLOSE-')
             if tpl_path and os.path.exists(tpl_path):
                 try:
-                    img_data = open(tpl_path, 'rb').read()
+                    img_data = _load_thumbnail(tpl_path, thumb_cache)
                     window['-TEMPLATE-THUMB-'].update(data=img_data)
                 except Exception:
                     pass
 
         if event == '-TEST-CLOSE-':
             # Interactive test for close-template
-            tpl = None
-            if isinstance(values, dict):
-                tpl = values.get('-TEMPLATE-CLOSE-')
+            tpl = vals.get('-TEMPLATE-CLOSE-')
             if not tpl:
-                tpl = None
-                candidate = None
-                # search for CloseAd.png in repo
-                root = os.path.abspath(os.path.dirname(__file__))
-                for dirpath, dirnames, filenames in os.walk(root):
-                    if 'CloseAd.png' in filenames:
-                        candidate = os.path.join(dirpath, 'CloseAd.png')
-                        break
-                if candidate:
-                    tpl = candidate
+                tpl = default_close_tpl
             window['-LOG-'].print(f"[popup-test] using template: {tpl}")
-            found = close_popup_if_present(log=lambda m: window.write_event_value('-THREAD_LOG-', m), templates=[tpl] if tpl else [])
+            found = close_popup_if_present(log=module_log, templates=[tpl] if tpl else [])
             window['-LOG-'].print(f"[popup-test] result: {found}")
             continue
 
         if event == '-START-':
             try:
-                interval = float(values['-INTERVAL-'])
+                interval = float(vals['-INTERVAL-'])
             except ValueError:
                 sg.popup_error('Interval must be a number')
                 continue
 
-            # Map some actions to manager-controlled modules
-            action_map = {
-                'Farm Campaign': ('campaign', campaign_loop),
-                'Arena': ('arena', arena_loop),
-                'Tag Arena': ('tag_arena', tag_arena_loop),
-            }
-
             # gather selections from the Listbox (-ACTIONS-) or legacy combo
             selections = []
-            if isinstance(values, dict):
-                sel = values.get('-ACTIONS-')
-                if sel:
-                    selections = sel
-                else:
-                    single = values.get('-ACTION-')
-                    if single:
-                        selections = [single]
+            sel = vals.get('-ACTIONS-')
+            if sel:
+                selections = sel
+            else:
+                single = vals.get('-ACTION-')
+                if single:
+                    selections = [single]
 
             if not selections:
                 sg.popup_error('No action selected')
                 continue
 
             # convert selections into a list of (display_name, internal_name, target)
-            seq = []
-            for item in selections:
-                if item in action_map:
-                    seq.append((item, action_map[item][0], action_map[item][1]))
-                else:
-                    seq.append((item, None, None))
+            seq = [(item, *ACTION_MAP.get(item, (None, None))) for item in selections]
 
             # simple single non-module fallback
             if len(seq) == 1 and seq[0][1] is None:
                 action = seq[0][0]
                 # prepare window (close popups, position) before starting single BotThread
                 try:
-                    tpl = values.get('-TEMPLATE-') if isinstance(values, dict) else None
+                    tpl = vals.get('-TEMPLATE-')
                     tpl = tpl if tpl else None
-                    close_tpl = values.get('-TEMPLATE-CLOSE-') if isinstance(values, dict) else None
+                    close_tpl = vals.get('-TEMPLATE-CLOSE-')
                     if not close_tpl:
-                        # search for CloseAd.png
-                        candidate = None
-                        root = os.path.abspath(os.path.dirname(__file__))
-                        for dirpath, dirnames, filenames in os.walk(root):
-                            if 'CloseAd.png' in filenames:
-                                candidate = os.path.join(dirpath, 'CloseAd.png')
-                                break
-                        if candidate:
-                            close_tpl = candidate
+                        close_tpl = default_close_tpl
                     if close_tpl:
-                        close_popup_if_present(log=_module_log, templates=[close_tpl])
+                        close_popup_if_present(log=module_log, templates=[close_tpl])
                     if tpl:
-                        ensure_game_window(log=_module_log, template_path=tpl)
+                        ensure_game_window(log=module_log, template_path=tpl)
                     else:
-                        ensure_game_window(log=_module_log)
+                        ensure_game_window(log=module_log)
                     if close_tpl:
-                        close_popup_if_present(log=_module_log, templates=[close_tpl])
+                        close_popup_if_present(log=module_log, templates=[close_tpl])
                 except Exception as exc:
-                    _module_log(f"[init] single-start prep error: {exc}")
+                    module_log(f"[init] single-start prep error: {exc}")
 
-                bot = BotThread(window, action, interval)
+                bot = BotThread(window, action, interval, log_func=module_log)
                 bot.start()
                 start_time = time.time()
                 running = True
@@ -213,102 +356,16 @@ def main():
             # multi-module sequence
             modules_to_run = [(name_key, target) for (display, name_key, target) in seq if name_key]
             try:
-                def _module_log(m: str):
-                    window.write_event_value('-THREAD_LOG-', m)
-
                 # prepare template paths
-                tpl = values.get('-TEMPLATE-') if isinstance(values, dict) else None
+                tpl = vals.get('-TEMPLATE-')
                 tpl = tpl if tpl else None
-                close_tpl = values.get('-TEMPLATE-CLOSE-') if isinstance(values, dict) else None
+                close_tpl = vals.get('-TEMPLATE-CLOSE-')
                 if not close_tpl:
-                    # search repo for CloseAd.png as fallback
-                    candidate = None
-                    root = os.path.abspath(os.path.dirname(__file__))
-                    for dirpath, dirnames, filenames in os.walk(root):
-                        if 'CloseAd.png' in filenames:
-                            candidate = os.path.join(dirpath, 'CloseAd.png')
-                            break
-                    if candidate:
-                        close_tpl = candidate
-
-                # controller to run modules sequentially and perform init checks between modules
-                class SequenceController(threading.Thread):
-                    def __init__(self, mgr, modules, win, log_func, tpl_path=None, close_path=None):
-                        super().__init__(daemon=True)
-                        self.mgr = mgr
-                        self.modules = modules
-                        self.win = win
-                        self.log = log_func
-                        self._stop = threading.Event()
-                        self.current = None
-                        self.tpl_path = tpl_path
-                        self.close_path = close_path
-
-                    def stop(self):
-                        self._stop.set()
-                        if self.current:
-                            try:
-                                self.mgr.stop_module(self.current)
-                            except Exception:
-                                pass
-
-                    def _prepare_window(self):
-                        # attempt to close popup, ensure window positioning, then close again
-                        try:
-                            if self.close_path:
-                                close_popup_if_present(log=self.log, templates=[self.close_path])
-                        except Exception:
-                            pass
-                        try:
-                            if self.tpl_path:
-                                ensure_game_window(log=self.log, template_path=self.tpl_path)
-                            else:
-                                ensure_game_window(log=self.log)
-                        except Exception:
-                            pass
-                        try:
-                            if self.close_path:
-                                close_popup_if_present(log=self.log, templates=[self.close_path])
-                        except Exception:
-                            pass
-
-                    def run(self):
-                        for name, target in self.modules:
-                            if self._stop.is_set():
-                                break
-                            
-                            # Check if module is on cooldown
-                            remaining = self.mgr.get_cooldown_remaining(name)
-                            if remaining > 0:
-                                mins, secs = divmod(int(remaining), 60)
-                                self.log(f"[sequence] {name} is on cooldown for {mins}m {secs}s; skipping until next cycle")
-                                self.win.write_event_value('-THREAD_LOG-', f"[sequence] skipping {name} (cooldown: {mins}m {secs}s)")
-                                continue
-                            
-                            # prepare window before each module
-                            self._prepare_window()
-                            try:
-                                if not self.mgr.is_registered(name):
-                                    self.mgr.register_module(name, target, log_func=self.log)
-                            except Exception:
-                                pass
-                            self.current = name
-                            self.win.write_event_value('-MODULE_STARTED-', name)
-                            self.mgr.start_module(name)
-                            while not self._stop.is_set() and self.mgr.is_running(name):
-                                time.sleep(0.2)
-                            try:
-                                self.mgr.stop_module(name)
-                                # Mark module as completed for cooldown tracking
-                                self.mgr.mark_completed(name)
-                            except Exception:
-                                pass
-                            self.win.write_event_value('-MODULE_ENDED-', name)
-                        self.win.write_event_value('-SEQUENCE_DONE-', True)
-
-                controller = SequenceController(manager, modules_to_run, window, _module_log, tpl_path=tpl, close_path=close_tpl)
-                controller_ref = controller
-                controller.start()
+                    close_tpl = default_close_tpl
+
+                seq_stop = threading.Event()
+                controller_ref = manager.submit_sequence(run_sequence, manager, modules_to_run, window, module_log,
+                                                         seq_stop, tpl_path=tpl, close_path=close_tpl)
                 window['-LOG-'].print(f"[manager] started module sequence: {[n for n,_ in modules_to_run]}")
                 window['-START-'].update(disabled=True)
                 window['-STOP-'].update(disabled=False)
@@ -328,10 +385,11 @@ def main():
             if bot:
                 bot.stop()
                 bot = None
-            # stop any running controller sequence
+            # stop any running controller sequence, then whichever module it launched
             if controller_ref:
+                seq_stop.set()
                 try:
-                    controller_ref.stop()
+                    manager.stop_all()
                 except Exception:
                     pass
                 controller_ref = None
@@ -343,30 +401,41 @@ def main():
             window['-STOP-'].update(disabled=True)
 
         elif event == '-THREAD_LOG-':
-            # This catches the message sent from the BotThread or modules.
-            msg = values['-THREAD_LOG-']
-            # filter out frequent module ticks (they're noisy)
-            try:
-                s = str(msg).strip()
-                if s.endswith('tick') or s.endswith('[tick]') or s.endswith(' tick'):
-                    # ignore tick messages
-                    pass
-                else:
-                    from datetime import datetime
-                    ts = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    window['-LOG-'].print(f"[{ts}] {msg}")
-            except Exception:
-                window['-LOG-'].print(msg)
+            # Flush everything queued by the BotThread or modules in one widget update.
+            msg = vals['-THREAD_LOG-']
+            batch = log_queue.drain()
+            if msg is not None:
+                # direct write_event_value callers still deliver the message in the event itself
+                batch.append(msg)
+            # format the timestamp at most once per wall-clock second
+            now_s = int(time.time())
+            if now_s != last_ts[0]:
+                last_ts[:] = [now_s, time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now_s))]
+            ts = last_ts[1]
+            lines = []
+            for msg in batch:
+                # filter out frequent module ticks (they're noisy)
+                try:
+                    s = str(msg).strip()
+                    if s.endswith('tick') or s.endswith('[tick]') or s.endswith(' tick'):
+                        # ignore tick messages
+                        continue
+                    lines.append(f"[{ts}] {msg}")
+                except Exception:
+                    lines.append(str(msg))
+            if lines:
+                # one Tk text insertion for the whole batch
+                window['-LOG-'].update(value='\n'.join(lines) + '\n', append=True)
 
         elif event == '-MODULE_STARTED-':
-            name = values['-MODULE_STARTED-']
+            name = vals['-MODULE_STARTED-']
             current_module_name = name
             start_time = time.time()
             running = True
             window['-LOG-'].print(f"[sequence] module started: {name}")
 
         elif event == '-MODULE_ENDED-':
-            name = values['-MODULE_ENDED-']
+            name = vals['-MODULE_ENDED-']
             window['-LOG-'].print(f"[sequence] module ended: {name}")
             current_module_name = None
 
@@ -6,62 +6,126 @@ Notes:
 - Templates should exist in the repo (e.g., modules/images/...). The helper
   `_find_template` will search the repo for the given filename.
 """
+from collections import deque
 from threading import Event
+import functools
+import logging
 import time
 import os
 from typing import Optional, Tuple, List
 
-from utils.screen import locate_on_screen
+from utils.screen import (grab_frame, locate_all_in, locate_each_in, locate_on_screen, locate_template_in,
+                          save_debug_screenshot, wait_for_template as wait_for_screen)
+from utils.templates import find_template
 from utils.controls import click, press
-from utils.popup import close_popup_if_present
+from utils.window import WINDOW_TARGET_WIDTH, WINDOW_TARGET_HEIGHT
 
+# set RSL_DEBUG=1 to save annotated screenshots of chosen battle buttons
+_DEBUG = os.environ.get('RSL_DEBUG') == '1'
 
+# fixed screen regions (x0, y0, x1, y1) for buttons that never move; the game window is
+# placed at (0, 0) and sized WINDOW_TARGET_WIDTH x WINDOW_TARGET_HEIGHT by ensure_game_window
+_BUTTON_ROIS = {
+    'BackButton.png': (0, 0, WINDOW_TARGET_WIDTH // 2, WINDOW_TARGET_HEIGHT // 2),  # top-left
+    'ArenaReturnButton.png': (0, WINDOW_TARGET_HEIGHT // 2, WINDOW_TARGET_WIDTH, WINDOW_TARGET_HEIGHT),  # bottom
+}
+
+
+@functools.lru_cache(maxsize=None)
 def _find_template(name: str) -> Optional[str]:
-    root = os.path.abspath(os.path.dirname(__file__))
-    for dirpath, dirnames, filenames in os.walk(root):
-        if name in filenames:
-            return os.path.join(dirpath, name)
-    # also check repo root
-    repo_root = os.path.abspath(os.path.join(root, '..'))
-    for dirpath, dirnames, filenames in os.walk(repo_root):
-        if name in filenames:
-            return os.path.join(dirpath, name)
-    return None
+    # templates don't move at runtime, so each name is only looked up once
+    return find_template(name, _BUTTON_ROIS)
+
+
+# messages use %-style args so they are only formatted if a handler will emit them;
+# per-candidate chatter is DEBUG and only shown with RSL_DEBUG=1
+_log = logging.getLogger('arena')
+_log.setLevel(logging.DEBUG if _DEBUG else logging.INFO)
+_log.propagate = False
+
+
+class _LogCallableHandler(logging.Handler):
+    """Forward arena records to the GUI `log` callable, or print them when there is none."""
 
+    def __init__(self, log=None) -> None:
+        super().__init__()
+        self._log = log
+        self.setFormatter(logging.Formatter('[arena] %(message)s'))
 
-def _log_fn(log, message: str) -> None:
-    if callable(log):
+    def emit(self, record: logging.LogRecord) -> None:
         try:
-            log(f"[arena] {message}")
+            message = self.format(record)
+            if callable(self._log):
+                self._log(message)
+            else:
+                print(message)
         except Exception:
             pass
-    else:
-        print(f"[arena] {message}")
+
+
+class _UsedPositions:
+    """Recently clicked button centers; a point is used if it is within `cell` px of one.
+
+    Recent clicks are bucketed into a grid: a point whose cell doesn't neighbour (or
+    is) the cell of a recent click is rejected without any distance math, and the rest
+    get the exact distance check against the few recent clicks.
+    """
+
+    def __init__(self, cell: int = 30, keep: int = 3) -> None:
+        self.cell = cell
+        self._recent = deque(maxlen=keep)
+        self._cells = set()
+
+    def _key(self, pt: Tuple[int, int]) -> Tuple[int, int]:
+        return (int(pt[0]) // self.cell, int(pt[1]) // self.cell)
+
+    def add(self, pt: Tuple[int, int]) -> None:
+        self._recent.append(pt)
+        # rebuild from the last `keep` clicks so older positions age out
+        self._cells = {(gx + dx, gy + dy)
+                       for gx, gy in map(self._key, self._recent)
+                       for dx in (-1, 0, 1) for dy in (-1, 0, 1)}
+
+    def clear(self) -> None:
+        self._recent.clear()
+        self._cells.clear()
+
+    def __contains__(self, pt: Tuple[int, int]) -> bool:
+        if self._key(pt) not in self._cells:
+            return False
+        r2 = self.cell * self.cell
+        return any((pt[0] - ux) ** 2 + (pt[1] - uy) ** 2 < r2 for ux, uy in self._recent)
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def __repr__(self) -> str:
+        return repr(list(self._recent))
 
 
 def _locate_and_click(template_name: str, log=None, retries: int = 3, wait: float = 0.6) -> Optional[Tuple[int, int]]:
     tpl = _find_template(template_name)
-    _log_fn(log, f"searching for {template_name} -> tpl={tpl}")
+    _log.debug("searching for %s -> tpl=%s", template_name, tpl)
     if not tpl:
-        _log_fn(log, f"template missing: {template_name}")
+        _log.warning("template missing: %s", template_name)
         return None
     for attempt in range(1, retries + 1):
         loc = None
         try:
             loc = locate_on_screen(tpl)
         except Exception as e:
-            _log_fn(log, f"locate error {template_name}: {e}")
+            _log.warning("locate error %s: %s", template_name, e)
             loc = None
         if loc:
             x, y = loc
             try:
                 click(int(x), int(y))
-                _log_fn(log, f"clicked {template_name} at ({x},{y})")
+                _log.debug("clicked %s at (%d,%d)", template_name, x, y)
                 return (int(x), int(y))
             except Exception as e:
-                _log_fn(log, f"click failed {template_name}: {e}")
+                _log.warning("click failed %s: %s", template_name, e)
         time.sleep(wait)
-    _log_fn(log, f"failed to find/click {template_name}")
+    _log.info("failed to find/click %s", template_name)
     return None
 
 
@@ -69,7 +133,17 @@ def arena_loop(stop_event: Event, log=None) -> None:
     """Run arena battles in sequence until tokens exhausted or stopped.
 
     Behavior follows the user's specification closely with robust retries and logs.
+    Messages go to `log` (the GUI's module logger) for the duration of the run.
     """
+    handler = _LogCallableHandler(log)
+    _log.addHandler(handler)
+    try:
+        _run_arena(stop_event, log)
+    finally:
+        _log.removeHandler(handler)
+
+
+def _run_arena(stop_event: Event, log=None) -> None:
     # templates used
     homescreen_tpl = 'homescreenCheck.png'
     back_tpl = 'BackButton.png'
@@ -81,30 +155,39 @@ def arena_loop(stop_event: Event, log=None) -> None:
     arena_battle_over_tpl = 'Arenabattleoverbutton.png'
     arena_return_tpl = 'ArenaReturnButton.png'
     close_tpl = 'CloseAd.png'
+    refresh_name = 'RefreshButton.png'
+
+    # resolve the paths probed inside the loops once, up front
+    homes = _find_template(homescreen_tpl)
+    back = _find_template(back_tpl)
+    closep = _find_template(close_tpl)
+    lab = _find_template(arena_battle_tpl)
+    refresh_tpl = _find_template(refresh_name)
+    over_tpl = _find_template(arena_battle_over_tpl)
 
     def ensure_homescreen():
-        _log_fn(log, 'ensuring homescreen')
+        _log.info('ensuring homescreen')
         while not stop_event.is_set():
-            loc = _find_template(homescreen_tpl)
-            if loc and locate_on_screen(loc):
-                _log_fn(log, 'homescreen detected')
+            # probe homescreen, Back and popup close concurrently against one capture, searched
+            # at half res and confirmed at full res around each hit
+            home_loc, back_loc, close_loc = locate_each_in(grab_frame(), [homes, back, closep], scale=0.5)
+            if home_loc:
+                _log.info('homescreen detected')
                 return True
             # try Back button
-            back = _find_template(back_tpl)
-            if back and locate_on_screen(back):
-                _log_fn(log, 'BackButton found, clicking')
-                click(*locate_on_screen(back))
+            if back_loc:
+                _log.debug('BackButton found, clicking')
+                click(*back_loc)
                 time.sleep(0.8)
                 continue
             # try closing popup
-            closep = _find_template(close_tpl)
-            if closep:
-                closed = close_popup_if_present(log=log, templates=[closep])
-                if closed:
-                    time.sleep(0.6)
-                    continue
+            if close_loc:
+                _log.debug('popup close found at %s, clicking', close_loc)
+                click(*close_loc)
+                time.sleep(0.6)
+                continue
             # nothing found, wait and retry
-            _log_fn(log, 'homescreen not found, retrying...')
+            _log.debug('homescreen not found, retrying...')
             time.sleep(1.0)
         return False
 
@@ -112,135 +195,132 @@ def arena_loop(stop_event: Event, log=None) -> None:
         """Try to find and click a template, closing popup if necessary."""
         tpl_path = _find_template(template_name)
         if not tpl_path:
-            _log_fn(log, f"template not found: {template_name}")
+            _log.warning("template not found: %s", template_name)
             return None
         for cycle in range(max_cycles):
-            loc = locate_on_screen(tpl_path)
+            # the target and the popup close button are checked on the same capture;
+            # the located centers are clicked directly rather than searched for again
+            loc, close_loc = locate_each_in(grab_frame(), [tpl_path, closep])
             if loc:
                 try:
                     click(*loc)
-                    _log_fn(log, f"clicked {template_name}")
+                    _log.info("clicked %s", template_name)
                     return (int(loc[0]), int(loc[1]))
                 except Exception as e:
-                    _log_fn(log, f"click failed: {e}")
-            # try close popup then retry
-            closep = _find_template(close_tpl)
-            if closep:
-                closed = close_popup_if_present(log=log, templates=[closep])
-                if closed:
-                    time.sleep(0.6)
-                    continue
+                    _log.warning("click failed: %s", e)
+            # close popup then retry
+            if close_loc:
+                click(*close_loc)
+                _log.info('closed popup at %s', close_loc)
+                time.sleep(0.6)
+                continue
             time.sleep(0.8)
-        _log_fn(log, f"failed to find {template_name} after retries")
+        _log.info("failed to find %s after retries", template_name)
+        return None
+
+    def wait_for_template(template_name: str, timeout: float = 2.0, poll: float = 0.1) -> bool:
+        """Wait until `template_name` is on screen, up to `timeout` seconds.
+
+        Replaces fixed settle sleeps after clicks: returns as soon as the next screen's
+        marker appears. Returns False on timeout/stop; callers still retry on their own.
+        """
+        return wait_for_screen(_find_template(template_name), timeout, poll, stop_event) is not None
+
+    def find_candidates(frame, tpl_path: str, max_matches: int = 5) -> List[Tuple[int, int]]:
+        """Up to `max_matches` button centers for `tpl_path` in `frame`, falling back to a single best match."""
+        found = []
+        try:
+            found = locate_all_in(frame, tpl_path, max_matches=max_matches)
+        except Exception as e:
+            _log.warning('locate_all_in error: %s', e)
+        if not found:
+            loc = locate_template_in(frame, tpl_path)
+            if loc:
+                found = [(int(loc[0]), int(loc[1]))]
+        return found
+
+    def find_fresh(frame, used: _UsedPositions) -> Optional[Tuple[int, int]]:
+        """The first button center for `lab` in `frame` that isn't in `used`, or None."""
+        # only one fresh button is needed. Two matches (kept >= 30 px apart) can both lie
+        # within 30 px of one used position, so 2*len(used)+1 matches normally include a
+        # fresh one; if the capped list is full and all used, search again uncapped
+        cap = len(used) * 2 + 1
+        candidates = find_candidates(frame, lab, max_matches=cap)
+        if len(candidates) >= cap and all(c in used for c in candidates):
+            candidates = find_candidates(frame, lab, max_matches=20)
+        _log.debug('found %d candidates: %s, used_positions=%r', len(candidates), candidates, used)
+        for c in candidates:
+            if c not in used:
+                _log.debug('selected candidate: %s', c)
+                return c
         return None
 
     # main routine - run one complete session (10 battles max), then exit
     # ensure homescreen
     if not ensure_homescreen():
-        _log_fn(log, 'stopping: could not ensure homescreen')
+        _log.info('stopping: could not ensure homescreen')
         return
 
     # find and click Battle button
     if not find_and_click_with_popup_retry(battle_tpl, max_cycles=5):
-        _log_fn(log, 'BattleButton not found after retries; exiting')
+        _log.info('BattleButton not found after retries; exiting')
         return
 
-    time.sleep(0.8)
+    wait_for_template(arena_btn_tpl)
     # click Arena on game modes
     if not find_and_click_with_popup_retry(arena_btn_tpl, max_cycles=5):
-        _log_fn(log, 'ArenaButton not found; exiting')
+        _log.info('ArenaButton not found; exiting')
         return
 
-    time.sleep(0.8)
+    wait_for_template(classic_arena_tpl)
     # click Classic Arena
     if not find_and_click_with_popup_retry(classic_arena_tpl, max_cycles=5):
-        _log_fn(log, 'classicArenaButton not found; exiting')
+        _log.info('classicArenaButton not found; exiting')
         return
 
-    time.sleep(0.8)
+    wait_for_template(arena_battle_tpl)
     # Now repeatedly perform up to 10 battles
     battles_done = 0
-    last_y = None
-    used_battle_positions: List[Tuple[int, int]] = []
+    used_battle_positions = _UsedPositions()
     while not stop_event.is_set() and battles_done < 10:
             # find arena battle button candidates (may be multiple per screen)
-            lab = _find_template(arena_battle_tpl)
             if not lab:
-                _log_fn(log, 'ArenaBattleButton template missing')
+                _log.warning('ArenaBattleButton template missing')
                 break
-            # use locate_all_on_screen when available to get multiple centers
-            try:
-                from utils.screen import locate_all_on_screen
-            except Exception:
-                locate_all_on_screen = None
 
-            candidates = []
-            if locate_all_on_screen:
-                try:
-                    candidates = locate_all_on_screen(lab, debug=True)
-                    _log_fn(log, f'locate_all_on_screen found {len(candidates)} candidates: {candidates}')
-                except Exception as e:
-                    _log_fn(log, f'locate_all_on_screen error: {e}')
-                    candidates = []
-            # fallback to single locate
-            if not candidates:
-                loc = locate_on_screen(lab)
-                if loc:
-                    _log_fn(log, f'fallback locate_on_screen found: {loc}')
-                    candidates = [(int(loc[0]), int(loc[1]))]
-
-            chosen = None
-            if candidates:
-                _log_fn(log, f'evaluating {len(candidates)} candidates, used_positions={used_battle_positions}')
-                for c in candidates:
-                    too_close = any(abs(c[0] - u[0]) < 30 and abs(c[1] - u[1]) < 30 for u in used_battle_positions)
-                    _log_fn(log, f'candidate {c} too_close={too_close}')
-                    if not too_close:
-                        chosen = c
-                        _log_fn(log, f'selected candidate: {chosen}')
-                        break
+            # one capture per cycle, shared by every template probe until the UI changes
+            frame = grab_frame()
+            chosen = find_fresh(frame, used_battle_positions)
 
             if not chosen:
-                _log_fn(log, 'no fresh ArenaBattleButton found; trying popup/refresh/scroll fallback')
+                _log.info('no fresh ArenaBattleButton found; trying popup/refresh/scroll fallback')
+                # probe popup close and refresh concurrently on the current frame
+                cloc, rloc = locate_each_in(frame, [closep, refresh_tpl])
                 # try closing popup
-                closep = _find_template(close_tpl)
-                if closep:
-                    closed = close_popup_if_present(log=log, templates=[closep])
-                    if closed:
-                        time.sleep(0.6)
-                        # try locating again
-                        if locate_all_on_screen:
-                            candidates = locate_all_on_screen(lab)
-                        else:
-                            loc = locate_on_screen(lab)
-                            candidates = [(int(loc[0]), int(loc[1]))] if loc else []
-                        for c in candidates:
-                            if not any(abs(c[0] - u[0]) < 30 and abs(c[1] - u[1]) < 30 for u in used_battle_positions):
-                                chosen = c
-                                break
+                if cloc:
+                    click(int(cloc[0]), int(cloc[1]))
+                    _log.info('closed popup at %s', cloc)
+                    time.sleep(0.6)
+                    # try locating again on a fresh capture
+                    frame = grab_frame()
+                    chosen = find_fresh(frame, used_battle_positions)
+                    if not chosen and refresh_tpl:
+                        rloc = locate_template_in(frame, refresh_tpl)
                 # try refresh button
-                if not chosen:
-                    refresh_tpl = _find_template('RefreshButton.png')
-                    if refresh_tpl:
-                        rloc = locate_on_screen(refresh_tpl)
-                        if rloc:
-                            try:
-                                click(int(rloc[0]), int(rloc[1]))
-                                _log_fn(log, 'clicked RefreshButton; clearing used positions')
-                                used_battle_positions.clear()
-                                time.sleep(1.0)
-                                if locate_all_on_screen:
-                                    candidates = locate_all_on_screen(lab)
-                                else:
-                                    loc = locate_on_screen(lab)
-                                    candidates = [(int(loc[0]), int(loc[1]))] if loc else []
-                                if candidates:
-                                    chosen = candidates[0]
-                            except Exception as e:
-                                _log_fn(log, f'Refresh click failed: {e}')
+                if not chosen and rloc:
+                    try:
+                        click(int(rloc[0]), int(rloc[1]))
+                        _log.info('clicked RefreshButton; clearing used positions')
+                        used_battle_positions.clear()
+                        time.sleep(1.0)
+                        candidates = find_candidates(grab_frame(), lab, max_matches=1)
+                        if candidates:
+                            chosen = candidates[0]
+                    except Exception as e:
+                        _log.warning('Refresh click failed: %s', e)
                 # if still not chosen after refresh, try scroll down
                 if not chosen:
-                    _log_fn(log, 'scrolling down to search for more teams')
+                    _log.info('scrolling down to search for more teams')
                     try:
                         press('pagedown')
                     except Exception:
@@ -251,21 +331,17 @@ def arena_loop(stop_event: Event, log=None) -> None:
                             pass
                     time.sleep(0.8)
                     used_battle_positions.clear()
-                    if locate_all_on_screen:
-                        try:
-                            candidates = locate_all_on_screen(lab)
-                        except Exception:
-                            candidates = []
-                    else:
-                        loc = locate_on_screen(lab)
-                        candidates = [(int(loc[0]), int(loc[1]))] if loc else []
+                    try:
+                        candidates = find_candidates(grab_frame(), lab, max_matches=1)
+                    except Exception:
+                        candidates = []
                     if candidates:
                         chosen = candidates[0]
-                        _log_fn(log, 'found candidates after scroll')
+                        _log.info('found candidates after scroll')
                 # final drag fallback if refresh button doesn't exist
                 if not chosen:
                     # No explicit refresh button: attempt up to 4 upward drag gestures
-                    _log_fn(log, 'attempting up to 4 drag-up gestures to reveal new teams')
+                    _log.info('attempting up to 4 drag-up gestures to reveal new teams')
                     try:
                         from utils.controls import drag
                     except Exception:
@@ -273,7 +349,7 @@ def arena_loop(stop_event: Event, log=None) -> None:
                     for di in range(4):
                         if stop_event.is_set():
                             break
-                        _log_fn(log, f'attempting drag-up {di+1}/4')
+                        _log.debug('attempting drag-up %d/4', di + 1)
                         try:
                             # perform a drag from lower screen area to upper area
                             if drag:
@@ -286,98 +362,94 @@ def arena_loop(stop_event: Event, log=None) -> None:
                                     pass
                             time.sleep(0.8)
                         except Exception as e:
-                            _log_fn(log, f'drag attempt failed: {e}')
+                            _log.warning('drag attempt failed: %s', e)
                         # after each drag, clear used positions and re-check
                         used_battle_positions.clear()
-                        if locate_all_on_screen:
-                            try:
-                                candidates = locate_all_on_screen(lab)
-                            except Exception:
-                                candidates = []
-                        else:
-                            loc = locate_on_screen(lab)
-                            candidates = [(int(loc[0]), int(loc[1]))] if loc else []
+                        try:
+                            candidates = find_candidates(grab_frame(), lab, max_matches=1)
+                        except Exception:
+                            candidates = []
                         if candidates:
                             chosen = candidates[0]
-                            _log_fn(log, f'found candidates after drag {di+1}')
+                            _log.info('found candidates after drag %d', di + 1)
                             break
 
             if not chosen:
-                _log_fn(log, 'ArenaBattleButton still not found; no more battles available')
+                _log.info('ArenaBattleButton still not found; no more battles available')
                 break
 
             bx, by = int(chosen[0]), int(chosen[1])
-            _log_fn(log, f'raw chosen center: ({bx}, {by})')
+            _log.debug('raw chosen center: (%d, %d)', bx, by)
             # Click directly at detected center (no offset for first attempt)
             click_x = bx
             click_y = by
-            _log_fn(log, f'clicking ArenaBattleButton at screen position ({click_x}, {click_y})')
-            # Save debug screenshot showing detected match
-            try:
-                from utils.screen import save_debug_screenshot
-                debug_path = os.path.join(os.path.dirname(__file__), '..', 'debug_arena_battle.png')
-                save_debug_screenshot(debug_path, template_path=lab, matches=[(click_x, click_y)])
-            except Exception:
-                pass
+            _log.info('clicking ArenaBattleButton at screen position (%d, %d)', click_x, click_y)
+            # Save debug screenshot showing detected match (a full-screen PNG write, so opt-in)
+            if _DEBUG:
+                try:
+                    debug_path = os.path.join(os.path.dirname(__file__), '..', 'debug_arena_battle.png')
+                    save_debug_screenshot(debug_path, template_path=lab, matches=[(click_x, click_y)])
+                except Exception:
+                    pass
             try:
                 click(click_x, click_y)
-                _log_fn(log, f'click executed at ({click_x}, {click_y})')
+                _log.debug('click executed at (%d, %d)', click_x, click_y)
             except Exception as e:
-                _log_fn(log, f'click failed: {e}'); click(bx, by)
+                _log.warning('click failed: %s', e); click(bx, by)
 
             # record this battle position to avoid re-clicking until refresh/scroll
-            used_battle_positions.append((bx, by))
-            if len(used_battle_positions) > 3:
-                used_battle_positions = used_battle_positions[-3:]
+            used_battle_positions.add((bx, by))
 
-            time.sleep(0.8)
+            wait_for_template(arena_start_tpl)
 
             # now on champion select: click arena_start
             if not find_and_click_with_popup_retry(arena_start_tpl, max_cycles=6):
-                _log_fn(log, 'arenastartbutton not found; aborting battle attempt')
+                _log.info('arenastartbutton not found; aborting battle attempt')
                 break
 
-            # wait for battle to finish: poll every 30s for battle over button
-            elapsed_wait = 0
-            while not stop_event.is_set():
-                time.sleep(30)
-                elapsed_wait += 30
-                over_tpl = _find_template(arena_battle_over_tpl)
-                if over_tpl and locate_on_screen(over_tpl):
-                    _log_fn(log, f'battle over detected after {elapsed_wait}s')
-                    click(*locate_on_screen(over_tpl))
-                    time.sleep(1.0)
+            # wait for battle to finish: poll for the battle over button starting at 2s and
+            # backing off x1.3 up to 20s; waiting on stop_event makes Stop take effect immediately
+            elapsed_wait = 0.0
+            delay = 2.0
+            while not stop_event.wait(delay):
+                elapsed_wait += delay
+                over_loc = locate_on_screen(over_tpl) if over_tpl else None
+                if over_loc:
+                    _log.info('battle over detected after %.0fs', elapsed_wait)
+                    click(*over_loc)
+                    wait_for_template(arena_return_tpl)
                     break
-                else:
-                    _log_fn(log, f'battle still running (waited {elapsed_wait}s)')
+                _log.debug('battle still running (waited %.0fs)', elapsed_wait)
+                delay = min(delay * 1.3, 20.0)
 
             # click return button
             if not find_and_click_with_popup_retry(arena_return_tpl, max_cycles=6):
-                _log_fn(log, 'ArenaReturnButton not found; attempting to continue')
+                _log.info('ArenaReturnButton not found; attempting to continue')
             else:
-                _log_fn(log, 'returned from battle stats')
+                _log.info('returned from battle stats')
 
             battles_done += 1
-            _log_fn(log, f'battles_done={battles_done}')
-            time.sleep(1.0)
+            _log.info('battles_done=%d', battles_done)
+            if battles_done < 10:
+                wait_for_template(arena_battle_tpl)
 
     # Completed sequence or stopped: return to homescreen
-    _log_fn(log, 'finished arena runs; returning to homescreen')
+    _log.info('finished arena runs; returning to homescreen')
     # press back until homescreen detected
     while not stop_event.is_set():
-        homes = _find_template(homescreen_tpl)
-        if homes and locate_on_screen(homes):
-            _log_fn(log, 'homescreen reached')
+        # one capture per pass, shared by the homescreen, Back and popup probes
+        home_loc, back_loc, close_loc = locate_each_in(grab_frame(), [homes, back, closep])
+        if home_loc:
+            _log.info('homescreen reached')
             break
-        back = _find_template(back_tpl)
-        if back and locate_on_screen(back):
-            click(*locate_on_screen(back))
+        if back_loc:
+            click(*back_loc)
             time.sleep(0.6)
             continue
         # try closing popup
-        closep = _find_template(close_tpl)
-        if closep:
-            close_popup_if_present(log=log, templates=[closep])
+        if close_loc:
+            _log.info('popup close found at %s, clicking', close_loc)
+            click(*close_loc)
         time.sleep(1.0)
 
     # small delay before exiting
@@ -1,6 +1,5 @@
 """Campaign module stub - loop that can be run in a thread."""
 from threading import Event
-import time
 
 
 def campaign_loop(stop_event: Event, log=None) -> None:
@@ -14,7 +13,9 @@ def campaign_loop(stop_event: Event, log=None) -> None:
                 print(msg)
         else:
             print(msg)
-        time.sleep(0.5)
+        # one wait doubles as the tick delay and the stop check
+        if stop_event.wait(0.5):
+            return
 
 
 if __name__ == "__main__":
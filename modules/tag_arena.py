@@ -9,27 +9,32 @@ Follows steps:
 - Max 10 battles, then 24hr cooldown
 """
 from threading import Event
+import functools
 import time
 import os
 from typing import Optional, Tuple, List
 
-from utils.screen import locate_on_screen
+from utils.screen import (grab_frame, locate_all_in, locate_any_on_screen, locate_each_in,
+                          locate_template_in, make_matcher, wait_for_template)
+from utils.templates import find_template
 from utils.controls import click, press
-from utils.popup import close_popup_if_present
+from utils.window import WINDOW_TARGET_WIDTH, WINDOW_TARGET_HEIGHT
 
+# fixed screen regions (x0, y0, x1, y1) for buttons that never move; the game window is
+# placed at (0, 0) and sized WINDOW_TARGET_WIDTH x WINDOW_TARGET_HEIGHT by ensure_game_window
+_BUTTON_ROIS = {
+    'BackButton.png': (0, 0, WINDOW_TARGET_WIDTH // 2, WINDOW_TARGET_HEIGHT // 2),  # top-left
+    'TagReturnButton.png': (0, WINDOW_TARGET_HEIGHT // 2, WINDOW_TARGET_WIDTH, WINDOW_TARGET_HEIGHT),  # bottom
+}
 
+
+@functools.lru_cache(maxsize=None)
 def _find_template(name: str) -> Optional[str]:
-    """Search repo for template file."""
-    root = os.path.abspath(os.path.dirname(__file__))
-    for dirpath, dirnames, filenames in os.walk(root):
-        if name in filenames:
-            return os.path.join(dirpath, name)
-    # also check repo root
-    repo_root = os.path.abspath(os.path.join(root, '..'))
-    for dirpath, dirnames, filenames in os.walk(repo_root):
-        if name in filenames:
-            return os.path.join(dirpath, name)
-    return None
+    """Search repo for template file (once per name; templates don't move at runtime).
+
+    Templates listed in `_BUTTON_ROIS` get their search region registered on first lookup.
+    """
+    return find_template(name, _BUTTON_ROIS)
 
 
 def _log_fn(log, message: str) -> None:
@@ -60,40 +65,59 @@ def tag_arena_loop(stop_event: Event, log=None) -> None:
     tag_return_tpl = 'TagReturnButton.png'  # return button
     close_tpl = 'CloseAd.png'
 
+    # resolve every template path once; helpers and polling loops take paths
+    homes = _find_template(homescreen_tpl)
+    back = _find_template(back_tpl)
+    closep = _find_template(close_tpl)
+    battle_path = _find_template(battle_tpl)
+    arena_btn_path = _find_template(arena_btn_tpl)
+    tag_arena_path = _find_template(tag_arena_tpl)
+    tbt = _find_template(tag_battle_tpl)
+    tag_start_path = _find_template(tag_start_tpl)
+    over_tpl = _find_template(tag_battle_over_tpl)
+    tag_return_path = _find_template(tag_return_tpl)
+    refresh_tpl = _find_template('RefreshButton.png')
+    # the battle-over check runs every second for the whole battle; bind it once
+    match_over = make_matcher(over_tpl) if over_tpl else None
+
     def ensure_homescreen():
         _log_fn(log, 'ensuring homescreen')
         while not stop_event.is_set():
-            loc = _find_template(homescreen_tpl)
-            if loc and locate_on_screen(loc):
+            # probe homescreen, Back and popup close against one capture (half-res search,
+            # confirmed at full res); homescreen wins over Back, Back over the popup
+            hit = locate_any_on_screen([homes, back, closep], scale=0.5)
+            if hit and hit[0] == homes:
                 _log_fn(log, 'homescreen detected')
                 return True
             # try Back button
-            back = _find_template(back_tpl)
-            if back and locate_on_screen(back):
+            if hit and hit[0] == back:
                 _log_fn(log, 'BackButton found, clicking')
-                click(*locate_on_screen(back))
+                click(hit[1], hit[2])
                 time.sleep(0.8)
                 continue
             # try closing popup
-            closep = _find_template(close_tpl)
-            if closep:
-                closed = close_popup_if_present(log=log, templates=[closep])
-                if closed:
-                    time.sleep(0.6)
-                    continue
+            if hit:
+                _log_fn(log, f'popup close found at {hit[1:]}, clicking')
+                click(hit[1], hit[2])
+                time.sleep(0.6)
+                continue
             # nothing found, wait and retry
             _log_fn(log, 'homescreen not found, retrying...')
             time.sleep(1.0)
         return False
 
-    def find_and_click_with_popup_retry(template_name: str, max_cycles: int = 3) -> Optional[Tuple[int, int]]:
-        """Try to find and click a template, closing popup if necessary."""
-        tpl_path = _find_template(template_name)
+    def find_and_click_with_popup_retry(tpl_path: Optional[str], template_name: str,
+                                        max_cycles: int = 3) -> Optional[Tuple[int, int]]:
+        """Try to find and click the template at `tpl_path`, closing popup if necessary.
+
+        `template_name` is only used in log messages.
+        """
         if not tpl_path:
             _log_fn(log, f"template not found: {template_name}")
             return None
         for cycle in range(max_cycles):
-            loc = locate_on_screen(tpl_path)
+            # the target and the popup close button are checked on the same capture
+            loc, close_loc = locate_each_in(grab_frame(), [tpl_path, closep])
             if loc:
                 try:
                     click(*loc)
@@ -101,13 +125,12 @@ def tag_arena_loop(stop_event: Event, log=None) -> None:
                     return (int(loc[0]), int(loc[1]))
                 except Exception as e:
                     _log_fn(log, f"click failed: {e}")
-            # try close popup then retry
-            closep = _find_template(close_tpl)
-            if closep:
-                closed = close_popup_if_present(log=log, templates=[closep])
-                if closed:
-                    time.sleep(0.6)
-                    continue
+            # close popup then retry
+            if close_loc:
+                click(*close_loc)
+                _log_fn(log, f'closed popup at {close_loc}')
+                time.sleep(0.6)
+                continue
             time.sleep(0.8)
         _log_fn(log, f"failed to find {template_name} after retries")
         return None
@@ -119,23 +142,24 @@ def tag_arena_loop(stop_event: Event, log=None) -> None:
         return
 
     # find and click Battle button
-    if not find_and_click_with_popup_retry(battle_tpl, max_cycles=5):
+    if not find_and_click_with_popup_retry(battle_path, battle_tpl, max_cycles=5):
         _log_fn(log, 'BattleButton not found after retries; exiting')
         return
 
-    time.sleep(0.8)
+    # wait for the next screen's button instead of a fixed settle sleep
+    wait_for_template(arena_btn_path, stop_event=stop_event)
     # click Arena button
-    if not find_and_click_with_popup_retry(arena_btn_tpl, max_cycles=5):
+    if not find_and_click_with_popup_retry(arena_btn_path, arena_btn_tpl, max_cycles=5):
         _log_fn(log, 'ArenaButton not found; exiting')
         return
 
-    time.sleep(0.8)
+    wait_for_template(tag_arena_path, stop_event=stop_event)
     # click Tag Team Arena
-    if not find_and_click_with_popup_retry(tag_arena_tpl, max_cycles=5):
+    if not find_and_click_with_popup_retry(tag_arena_path, tag_arena_tpl, max_cycles=5):
         _log_fn(log, 'TagTeamArena button not found; exiting')
         return
 
-    time.sleep(0.8)
+    wait_for_template(tbt, stop_event=stop_event)
     # Now repeatedly perform up to 10 battles
     battles_done = 0
     last_y = None
@@ -143,31 +167,25 @@ def tag_arena_loop(stop_event: Event, log=None) -> None:
     
     while not stop_event.is_set() and battles_done < 10:
             # find tag battle button candidates
-            tbt = _find_template(tag_battle_tpl)
             if not tbt:
                 _log_fn(log, 'TagBattleButton template missing')
                 break
             
-            # use locate_all_on_screen when available
-            try:
-                from utils.screen import locate_all_on_screen
-            except Exception:
-                locate_all_on_screen = None
-
+            # one capture per cycle, shared by every template probe until the UI changes
+            frame = grab_frame()
             candidates = []
-            if locate_all_on_screen:
-                try:
-                    candidates = locate_all_on_screen(tbt, debug=True)
-                    _log_fn(log, f'locate_all_on_screen found {len(candidates)} candidates: {candidates}')
-                except Exception as e:
-                    _log_fn(log, f'locate_all_on_screen error: {e}')
-                    candidates = []
+            try:
+                candidates = locate_all_in(frame, tbt)
+                _log_fn(log, f'locate_all_in found {len(candidates)} candidates: {candidates}')
+            except Exception as e:
+                _log_fn(log, f'locate_all_in error: {e}')
+                candidates = []
             
             # fallback to single locate
             if not candidates:
-                loc = locate_on_screen(tbt)
+                loc = locate_template_in(frame, tbt)
                 if loc:
-                    _log_fn(log, f'fallback locate_on_screen found: {loc}')
+                    _log_fn(log, f'fallback single locate found: {loc}')
                     candidates = [(int(loc[0]), int(loc[1]))]
 
             chosen = None
@@ -183,41 +201,34 @@ def tag_arena_loop(stop_event: Event, log=None) -> None:
 
             if not chosen:
                 _log_fn(log, 'no fresh TagBattleButton found; trying popup/refresh/scroll fallback')
+                # probe popup close and refresh on the current frame
+                cloc, rloc = locate_each_in(frame, [closep, refresh_tpl])
                 # try closing popup
-                closep = _find_template(close_tpl)
-                if closep:
-                    closed = close_popup_if_present(log=log, templates=[closep])
-                    if closed:
-                        time.sleep(0.6)
-                        if locate_all_on_screen:
-                            candidates = locate_all_on_screen(tbt)
-                        else:
-                            loc = locate_on_screen(tbt)
-                            candidates = [(int(loc[0]), int(loc[1]))] if loc else []
-                        for c in candidates:
-                            if not any(abs(c[0] - u[0]) < 30 and abs(c[1] - u[1]) < 30 for u in used_battle_positions):
-                                chosen = c
-                                break
+                if cloc:
+                    click(int(cloc[0]), int(cloc[1]))
+                    _log_fn(log, f'closed popup at {cloc}')
+                    time.sleep(0.6)
+                    # try locating again on a fresh capture
+                    frame = grab_frame()
+                    candidates = locate_all_in(frame, tbt)
+                    for c in candidates:
+                        if not any(abs(c[0] - u[0]) < 30 and abs(c[1] - u[1]) < 30 for u in used_battle_positions):
+                            chosen = c
+                            break
+                    if not chosen and refresh_tpl:
+                        rloc = locate_template_in(frame, refresh_tpl)
                 # try refresh button
-                if not chosen:
-                    refresh_tpl = _find_template('RefreshButton.png')
-                    if refresh_tpl:
-                        rloc = locate_on_screen(refresh_tpl)
-                        if rloc:
-                            try:
-                                click(int(rloc[0]), int(rloc[1]))
-                                _log_fn(log, 'clicked RefreshButton; clearing used positions')
-                                used_battle_positions.clear()
-                                time.sleep(1.0)
-                                if locate_all_on_screen:
-                                    candidates = locate_all_on_screen(tbt)
-                                else:
-                                    loc = locate_on_screen(tbt)
-                                    candidates = [(int(loc[0]), int(loc[1]))] if loc else []
-                                if candidates:
-                                    chosen = candidates[0]
-                            except Exception as e:
-                                _log_fn(log, f'Refresh click failed: {e}')
+                if not chosen and rloc:
+                    try:
+                        click(int(rloc[0]), int(rloc[1]))
+                        _log_fn(log, 'clicked RefreshButton; clearing used positions')
+                        used_battle_positions.clear()
+                        time.sleep(1.0)
+                        candidates = locate_all_in(grab_frame(), tbt)
+                        if candidates:
+                            chosen = candidates[0]
+                    except Exception as e:
+                        _log_fn(log, f'Refresh click failed: {e}')
                 # if still not chosen after refresh, try scroll down
                 if not chosen:
                     _log_fn(log, 'scrolling down to search for more teams')
@@ -231,14 +242,10 @@ def tag_arena_loop(stop_event: Event, log=None) -> None:
                             pass
                     time.sleep(0.8)
                     used_battle_positions.clear()
-                    if locate_all_on_screen:
-                        try:
-                            candidates = locate_all_on_screen(tbt)
-                        except Exception:
-                            candidates = []
-                    else:
-                        loc = locate_on_screen(tbt)
-                        candidates = [(int(loc[0]), int(loc[1]))] if loc else []
+                    try:
+                        candidates = locate_all_in(grab_frame(), tbt)
+                    except Exception:
+                        candidates = []
                     if candidates:
                         chosen = candidates[0]
                         _log_fn(log, 'found candidates after scroll')
@@ -267,14 +274,10 @@ def tag_arena_loop(stop_event: Event, log=None) -> None:
                             _log_fn(log, f'drag attempt failed: {e}')
                         # after each drag, clear used positions and re-check
                         used_battle_positions.clear()
-                        if locate_all_on_screen:
-                            try:
-                                candidates = locate_all_on_screen(tbt)
-                            except Exception:
-                                candidates = []
-                        else:
-                            loc = locate_on_screen(tbt)
-                            candidates = [(int(loc[0]), int(loc[1]))] if loc else []
+                        try:
+                            candidates = locate_all_in(grab_frame(), tbt)
+                        except Exception:
+                            candidates = []
                         if candidates:
                             chosen = candidates[0]
                             _log_fn(log, f'found candidates after drag {di+1}')
@@ -309,36 +312,40 @@ def tag_arena_loop(stop_event: Event, log=None) -> None:
                 used_battle_positions = used_battle_positions[-3:]
             last_y = by
 
-            time.sleep(0.8)
+            wait_for_template(tag_start_path, stop_event=stop_event)
 
             # now on champion select: click tag_start
-            if not find_and_click_with_popup_retry(tag_start_tpl, max_cycles=6):
+            if not find_and_click_with_popup_retry(tag_start_path, tag_start_tpl, max_cycles=6):
                 _log_fn(log, 'tag start button not found; aborting battle attempt')
                 break
 
-            # wait for battle to finish: poll every 30s for battle over button
+            # wait for battle to finish: poll every second for the battle over button;
+            # waiting on stop_event makes Stop take effect immediately. Each capture reuses
+            # the buffer of the frame checked last time
             elapsed_wait = 0
-            while not stop_event.is_set():
-                time.sleep(30)
-                elapsed_wait += 30
-                over_tpl = _find_template(tag_battle_over_tpl)
-                if over_tpl and locate_on_screen(over_tpl):
+            frame = None
+            while not stop_event.wait(1.0):
+                elapsed_wait += 1
+                frame = grab_frame(out=frame)
+                over_loc = match_over(frame) if match_over else None
+                if over_loc:
                     _log_fn(log, f'battle over detected after {elapsed_wait}s')
-                    click(*locate_on_screen(over_tpl))
-                    time.sleep(1.0)
+                    click(*over_loc)
+                    wait_for_template(tag_return_path, stop_event=stop_event)
                     break
-                else:
+                if elapsed_wait % 30 == 0:
                     _log_fn(log, f'battle still running (waited {elapsed_wait}s)')
 
             # click return button
-            if not find_and_click_with_popup_retry(tag_return_tpl, max_cycles=6):
+            if not find_and_click_with_popup_retry(tag_return_path, tag_return_tpl, max_cycles=6):
                 _log_fn(log, 'TagReturnButton not found; attempting to continue')
             else:
                 _log_fn(log, 'returned from battle stats')
 
             battles_done += 1
             _log_fn(log, f'battles_done={battles_done}')
-            time.sleep(1.0)
+            if battles_done < 10:
+                wait_for_template(tbt, stop_event=stop_event)
 
     # After 10 battles, indicate session complete (24hr cooldown applies)
     _log_fn(log, 'tag arena finished; no more tokens available (24hr cooldown)')
@@ -346,19 +353,19 @@ def tag_arena_loop(stop_event: Event, log=None) -> None:
     # return to homescreen
     _log_fn(log, 'returning to homescreen')
     while not stop_event.is_set():
-        homes = _find_template(homescreen_tpl)
-        if homes and locate_on_screen(homes):
+        # one half-res capture per pass, shared by the homescreen, Back and popup probes
+        hit = locate_any_on_screen([homes, back, closep], scale=0.5)
+        if hit and hit[0] == homes:
             _log_fn(log, 'homescreen reached')
             break
-        back = _find_template(back_tpl)
-        if back and locate_on_screen(back):
-            click(*locate_on_screen(back))
+        if hit and hit[0] == back:
+            click(hit[1], hit[2])
             time.sleep(0.6)
             continue
         # try closing popup
-        closep = _find_template(close_tpl)
-        if closep:
-            close_popup_if_present(log=log, templates=[closep])
+        if hit:
+            _log_fn(log, f'popup close found at {hit[1:]}, clicking')
+            click(hit[1], hit[2])
         time.sleep(1.0)
 
     time.sleep(1.0)
@@ -0,0 +1,37 @@
+import unittest
+
+from modules.arena import _UsedPositions
+
+
+class UsedPositionsTest(unittest.TestCase):
+    def test_point_near_click_is_used(self):
+        used = _UsedPositions()
+        used.add((100, 200))
+        self.assertIn((100, 200), used)
+        self.assertIn((110, 220), used)
+
+    def test_adjacent_button_40px_away_is_fresh(self):
+        # neighbouring grid cells, but outside the 30 px radius
+        used = _UsedPositions()
+        used.add((100, 200))
+        self.assertNotIn((100, 240), used)
+        self.assertNotIn((140, 200), used)
+
+    def test_old_clicks_age_out(self):
+        used = _UsedPositions(keep=2)
+        for pt in [(100, 100), (300, 300), (500, 500)]:
+            used.add(pt)
+        self.assertNotIn((100, 100), used)
+        self.assertIn((500, 500), used)
+        self.assertEqual(len(used), 2)
+
+    def test_clear(self):
+        used = _UsedPositions()
+        used.add((100, 100))
+        used.clear()
+        self.assertNotIn((100, 100), used)
+        self.assertEqual(len(used), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,9 +7,10 @@ Strategy:
 - Return True if a popup was detected and closed, False otherwise.
 """
 from typing import List, Optional
+import os
 import time
 
-from .screen import locate_on_screen
+from .screen import grab_frame, locate_each_in
 from .controls import click
 
 
@@ -21,7 +22,7 @@ def close_popup_if_present(log: Optional[callable] = None,
     """Try to find and click a popup close button using provided templates.
 
     - `templates`: list of file paths to template images (close icons).
-    - `threshold`: matching threshold (used by locate_on_screen when OpenCV is available).
+    - `threshold`: matching threshold (used when OpenCV is available).
     - Returns True if a click was performed, False otherwise.
     """
     if templates is None:
@@ -35,6 +36,9 @@ def close_popup_if_present(log: Optional[callable] = None,
                 pass
         return False
 
+    # only feeds the per-attempt log lines, so stat each file once rather than per attempt
+    exists = {tpl: os.path.exists(tpl) for tpl in templates if tpl} if callable(log) else {}
+
     for attempt in range(1, max_attempts + 1):
         if callable(log):
             try:
@@ -42,30 +46,27 @@ def close_popup_if_present(log: Optional[callable] = None,
             except Exception:
                 pass
 
-        for tpl in templates:
-            if not tpl:
-                continue
-            try:
-                import os
-                exists = os.path.exists(tpl)
-            except Exception:
-                exists = False
-            if callable(log):
+        if callable(log):
+            for tpl in templates:
+                if not tpl:
+                    continue
                 try:
-                    log(f"[popup] checking template: {tpl} (exists={exists})")
+                    log(f"[popup] checking template: {tpl} (exists={exists[tpl]})")
                 except Exception:
                     pass
 
-            try:
-                loc = locate_on_screen(tpl, threshold=threshold)
-            except Exception as e:
-                loc = None
-                if callable(log):
-                    try:
-                        log(f"[popup] locate_on_screen error for {tpl}: {e}")
-                    except Exception:
-                        pass
+        # one capture per attempt; the templates are matched against it concurrently
+        try:
+            locs = locate_each_in(grab_frame(), templates, threshold=threshold)
+        except Exception as e:
+            locs = []
+            if callable(log):
+                try:
+                    log(f"[popup] locate error: {e}")
+                except Exception:
+                    pass
 
+        for tpl, loc in zip(templates, locs):
             if loc:
                 x, y = loc
                 try:
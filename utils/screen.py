@@ -1,9 +1,15 @@
 """Screen utilities: lightweight wrappers for screenshots and template locate.
 
 These are minimal stubs that prefer `pyautogui` and optionally `cv2` if installed.
+When `mss` is also installed, frames are captured straight into numpy arrays,
+skipping pyautogui's PIL image round-trip.
 Replace with robust OpenCV template-matching logic as needed.
 """
-from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
 import os
 try:
     import pyautogui
@@ -17,6 +23,132 @@ except Exception:
     cv2 = None
     np = None
 
+try:
+    import mss
+except Exception:  # pragma: no cover - optional dependency
+    mss = None
+
+try:
+    from numba import njit
+except Exception:  # pragma: no cover - optional dependency
+    njit = None
+
+
+# cv2.matchTemplate releases the GIL, so independent probes of one frame can overlap;
+# capped so matching doesn't starve the game of cores
+_MATCH_POOL = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix='match')
+
+# decoded grayscale templates keyed by path; template files don't change while the bot runs
+_TEMPLATE_CACHE: Dict[str, object] = {}
+# downscaled variants keyed by (path, scale)
+_SCALED_CACHE: Dict[Tuple[str, float], object] = {}
+# alpha masks keyed by (path, scale); None for templates without transparency
+_MASK_CACHE: Dict[Tuple[str, float], object] = {}
+# optional search region (x0, y0, x1, y1) in screen pixels per template path
+_TEMPLATE_ROIS: Dict[str, Tuple[int, int, int, int]] = {}
+
+
+def set_template_roi(template_path: str, roi: Optional[Tuple[int, int, int, int]]) -> None:
+    """Restrict matching of `template_path` to `roi` = (x0, y0, x1, y1); None clears it.
+
+    Use for buttons with a fixed on-screen region: matching a small slice of the
+    frame is far cheaper than scanning the whole screen.
+    """
+    if roi is None:
+        _TEMPLATE_ROIS.pop(template_path, None)
+    else:
+        _TEMPLATE_ROIS[template_path] = tuple(int(v) for v in roi)
+
+
+def load_template(template_path: str) -> Optional[object]:
+    """Return the grayscale uint8 template ndarray for `template_path`, decoding it only once.
+
+    PNGs with transparent pixels also get an alpha mask (see `_scaled_mask`) so their
+    background doesn't take part in matching.
+    Returns None if OpenCV is unavailable or the image can't be read (not cached, so a
+    template added later is still picked up).
+    """
+    if cv2 is None:
+        return None
+    tpl = _TEMPLATE_CACHE.get(template_path)
+    if tpl is None:
+        raw = cv2.imread(template_path, cv2.IMREAD_UNCHANGED)
+        if raw is None:
+            return None
+        if raw.dtype != np.uint8:
+            # 16-bit PNGs; matching on single bytes touches half the memory
+            raw = cv2.convertScaleAbs(raw, alpha=255.0 / np.iinfo(raw.dtype).max)
+        mask = None
+        if raw.ndim == 2:
+            tpl = raw
+        elif raw.shape[2] == 4:
+            alpha = raw[:, :, 3]
+            # fully opaque alpha adds nothing but cost to the match
+            if alpha.min() < 255:
+                mask = np.ascontiguousarray(alpha)
+            tpl = cv2.cvtColor(raw, cv2.COLOR_BGRA2GRAY)
+        else:
+            tpl = cv2.cvtColor(raw, cv2.COLOR_BGR2GRAY)
+        _MASK_CACHE[(template_path, 1.0)] = mask
+        _TEMPLATE_CACHE[template_path] = np.ascontiguousarray(tpl)
+        tpl = _TEMPLATE_CACHE[template_path]
+    return tpl
+
+
+class PreparedTemplate(NamedTuple):
+    """A grayscale template plus the constants a normalized correlation needs from it."""
+    gray: object  # C-contiguous uint8 ndarray
+    tw: int
+    th: int
+    mean: float
+    norm: float  # L2 norm of (gray - mean)
+
+
+_PREPARED_CACHE: Dict[str, PreparedTemplate] = {}
+
+
+def prepare_template(template_path: str) -> Optional[PreparedTemplate]:
+    """Return the `PreparedTemplate` for `template_path`, computed once; None if unavailable."""
+    prepared = _PREPARED_CACHE.get(template_path)
+    if prepared is None:
+        tpl = load_template(template_path)
+        if tpl is None:
+            return None
+        mean = float(tpl.mean())
+        norm = float(np.sqrt(((tpl.astype(np.float64) - mean) ** 2).sum()))
+        prepared = PreparedTemplate(tpl, tpl.shape[1], tpl.shape[0], mean, norm)
+        _PREPARED_CACHE[template_path] = prepared
+    return prepared
+
+
+@functools.lru_cache(maxsize=1)
+def get_monitor_info() -> Optional[Dict[str, int]]:
+    """Return the primary monitor geometry as {'left', 'top', 'width', 'height'}.
+
+    Queried once per session; the game window is positioned on the primary monitor
+    and its resolution isn't expected to change while the bot runs.
+    """
+    if pyautogui is not None:
+        w, h = pyautogui.size()
+        return {'left': 0, 'top': 0, 'width': int(w), 'height': int(h)}
+    if mss is not None:
+        with mss.mss() as sct:
+            mon = sct.monitors[1]
+        return {k: int(mon[k]) for k in ('left', 'top', 'width', 'height')}
+    return None
+
+
+# mss handles are bound to the thread that created them, so keep one per thread
+_MSS_LOCAL = threading.local()
+
+
+def _mss_grabber():
+    sct = getattr(_MSS_LOCAL, 'sct', None)
+    if sct is None:
+        sct = mss.mss()
+        _MSS_LOCAL.sct = sct
+    return sct
+
 
 def screenshot() -> Optional[object]:
     """Return a screenshot object (pyautogui Image) or None if unavailable."""
@@ -25,61 +157,349 @@ def screenshot() -> Optional[object]:
     return pyautogui.screenshot()
 
 
-def locate_on_screen(template_path: str, threshold: float = 0.8) -> Optional[Tuple[int, int]]:
-    """Locate `template_path` on screen. Returns (x,y) center or None.
+def grab_frame(out=None) -> Optional[object]:
+    """Capture the screen once as a grayscale ndarray for matching several templates.
 
-    This is a placeholder: if `cv2` is installed it will attempt simple template matching.
+    `out` is an optional frame from an earlier call that the caller no longer needs; the
+    new frame is written into it instead of a fresh ~2 MB allocation (mss path only).
+    Returns None when OpenCV or a capture backend is unavailable; the `*_in` helpers
+    then fall back to pyautogui's own on-screen search.
     """
+    if cv2 is None:
+        return None
+    if mss is not None:
+        # mss exposes the raw BGRA buffer via the array interface; no PIL image involved
+        img = np.asarray(_mss_grabber().grab(get_monitor_info()))
+        if out is not None and out.shape == img.shape[:2]:
+            return cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY, dst=out)
+        return cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY)
     if pyautogui is None:
         return None
-    if cv2 is None:
-        # fallback to pyautogui.locateCenterOnScreen if available
-        try:
-            loc = pyautogui.locateCenterOnScreen(template_path)
-            return (loc.x, loc.y) if loc else None
-        except Exception:
+    # let PIL collapse RGB to luma before the array copy, so numpy only ever holds
+    # one byte per pixel instead of copying RGB and converting afterwards
+    return np.asarray(pyautogui.screenshot().convert('L'))
+
+
+def _scale_frame(frame, scale: float):
+    if scale == 1.0:
+        return frame
+    return cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+
+def _scaled_template(template_path: str, scale: float) -> Optional[object]:
+    """Return the template resized by `scale` (cached), or None if unavailable."""
+    if scale == 1.0:
+        return load_template(template_path)
+    key = (template_path, scale)
+    tpl = _SCALED_CACHE.get(key)
+    if tpl is None:
+        full = load_template(template_path)
+        if full is None:
             return None
+        tpl = cv2.resize(full, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        _SCALED_CACHE[key] = tpl
+    return tpl
+
+
+def _scaled_mask(template_path: str, scale: float) -> Optional[object]:
+    """Return the alpha mask matching `_scaled_template(template_path, scale)`, or None."""
+    key = (template_path, scale)
+    if key not in _MASK_CACHE:
+        full = _MASK_CACHE.get((template_path, 1.0))
+        if full is not None:
+            # nearest keeps the mask binary-ish at the edges
+            full = cv2.resize(full, None, fx=scale, fy=scale, interpolation=cv2.INTER_NEAREST)
+        _MASK_CACHE[key] = full
+    return _MASK_CACHE[key]
 
-    # simple OpenCV-based locate
-    img = np.array(pyautogui.screenshot())
-    img_gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    tpl = cv2.imread(template_path, cv2.IMREAD_GRAYSCALE)
+
+def _match(frame, template_path: str, tpl, scale: float = 1.0):
+    """Run TM_CCOEFF_NORMED of `tpl` over `frame`, masked by the template's alpha if it has one."""
+    mask = _scaled_mask(template_path, scale)
+    if mask is None:
+        return cv2.matchTemplate(frame, tpl, cv2.TM_CCOEFF_NORMED)
+    res = cv2.matchTemplate(frame, tpl, cv2.TM_CCOEFF_NORMED, mask=mask)
+    # masked normalisation divides by zero on flat patches, yielding inf/nan
+    res[~np.isfinite(res)] = 0
+    return res
+
+
+def _crop_roi(frame, template_path: str, scale: float = 1.0):
+    """Crop `frame` to the template's registered ROI; returns (view, x offset, y offset)."""
+    roi = _TEMPLATE_ROIS.get(template_path)
+    if not roi:
+        return frame, 0, 0
+    fh, fw = frame.shape[:2]
+    x0, y0, x1, y1 = (int(v * scale) for v in roi)
+    x0, x1 = max(0, x0), min(fw, x1)
+    y0, y1 = max(0, y0), min(fh, y1)
+    return frame[y0:y1, x0:x1], x0, y0
+
+
+def _locate_scaled(small_frame, template_path: str, threshold: float, scale: float) -> Optional[Tuple[int, int]]:
+    # `small_frame` is already resized by `scale`; the returned center is in full-frame pixels
+    tpl = _scaled_template(template_path, scale)
     if tpl is None:
         return None
-    res = cv2.matchTemplate(img_gray, tpl, cv2.TM_CCOEFF_NORMED)
+    small_frame, ox, oy = _crop_roi(small_frame, template_path, scale)
+    th, tw = tpl.shape[:2]
+    if th > small_frame.shape[0] or tw > small_frame.shape[1]:
+        return None
+    res = _match(small_frame, template_path, tpl, scale)
     _, max_val, _, max_loc = cv2.minMaxLoc(res)
     if max_val >= threshold:
-        th, tw = tpl.shape[:2]
-        cx = max_loc[0] + tw // 2
-        cy = max_loc[1] + th // 2
+        cx = (ox + max_loc[0] + tw / 2) / scale
+        cy = (oy + max_loc[1] + th / 2) / scale
         return (int(cx), int(cy))
     return None
 
 
-def locate_all_on_screen(template_path: str, threshold: float = 0.8, debug: bool = False) -> list:
-    """Return list of center (x,y) matches for template_path on the screen.
+# a downscaled match loses a little score to interpolation, so the coarse pass accepts
+# slightly weaker hits and lets the full-resolution refine apply the real threshold
+_COARSE_SLACK = 0.05
+# extra pixels around the coarse hit searched by the refine pass
+_REFINE_PAD = 8
+# coarse peaks the refine pass tries before falling back to a full-resolution search;
+# small downscaled templates can score a false peak above the real target
+_COARSE_PEAKS = 3
 
-    Uses OpenCV when available to perform template matching and return all
-    matches above `threshold`. Falls back to `pyautogui.locateAllOnScreen`.
-    Deduplicates nearby matches and returns only the strongest candidates.
-    
-    Args:
-        template_path: path to template image
-        threshold: match confidence threshold (0.0-1.0)
-        debug: if True, print debug info about matches
+
+def _coarse_peaks(small_frame, template_path: str, threshold: float, scale: float,
+                  k: int) -> List[Tuple[int, int]]:
+    # up to `k` coarse hits as full-frame centers, strongest first, each at a different spot
+    tpl = _scaled_template(template_path, scale)
+    if tpl is None:
+        return []
+    small_frame, ox, oy = _crop_roi(small_frame, template_path, scale)
+    th, tw = tpl.shape[:2]
+    if th > small_frame.shape[0] or tw > small_frame.shape[1]:
+        return []
+    res = _match(small_frame, template_path, tpl, scale)
+    peaks = []
+    for _ in range(k):
+        _, max_val, _, (mx, my) = cv2.minMaxLoc(res)
+        if max_val < threshold:
+            break
+        peaks.append((int((ox + mx + tw / 2) / scale), int((oy + my + th / 2) / scale)))
+        # blank this peak's neighbourhood so the next maximum is somewhere else
+        res[max(0, my - th // 2):my + th // 2 + 1, max(0, mx - tw // 2):mx + tw // 2 + 1] = -1.0
+    return peaks
+
+
+def _refine(frame, template_path: str, center: Tuple[int, int], threshold: float) -> Optional[Tuple[int, int]]:
+    # full-resolution match restricted to a small window around a coarse hit
+    tpl = load_template(template_path)
+    th, tw = tpl.shape[:2]
+    fh, fw = frame.shape[:2]
+    x0 = max(0, center[0] - tw // 2 - _REFINE_PAD)
+    y0 = max(0, center[1] - th // 2 - _REFINE_PAD)
+    x1 = min(fw, center[0] + tw - tw // 2 + _REFINE_PAD)
+    y1 = min(fh, center[1] + th - th // 2 + _REFINE_PAD)
+    window = frame[y0:y1, x0:x1]
+    if th > window.shape[0] or tw > window.shape[1]:
+        return None
+    res = _match(window, template_path, tpl)
+    _, max_val, _, max_loc = cv2.minMaxLoc(res)
+    if max_val >= threshold:
+        return (x0 + max_loc[0] + tw // 2, y0 + max_loc[1] + th // 2)
+    return None
+
+
+def _locate_coarse_fine(frame, small_frame, template_path: str, threshold: float,
+                        scale: float) -> Optional[Tuple[int, int]]:
+    if scale == 1.0:
+        return _locate_scaled(frame, template_path, threshold, 1.0)
+    peaks = _coarse_peaks(small_frame, template_path, threshold - _COARSE_SLACK, scale, _COARSE_PEAKS)
+    if not peaks:
+        return None
+    for center in peaks:
+        loc = _refine(frame, template_path, center, threshold)
+        if loc:
+            return loc
+    # every coarse hit was a false peak, but the target may still be on screen below them
+    # at the coarse scale; only a full-resolution search can tell
+    return _locate_scaled(frame, template_path, threshold, 1.0)
+
+
+def locate_template_in(frame, template_path: str, threshold: float = 0.8,
+                       scale: float = 1.0) -> Optional[Tuple[int, int]]:
+    """Locate `template_path` in a frame from `grab_frame()`. Returns (x,y) center or None.
+
+    `scale` < 1 searches a downscaled frame and template first (e.g. 0.5 does ~4x less
+    work), then confirms a hit at full resolution in a small window around it, so the
+    threshold and the returned center are those of a full-resolution match.
     """
-    results = []
+    if frame is None:
+        return _pyautogui_locate(template_path)
+    return _locate_coarse_fine(frame, _scale_frame(frame, scale), template_path, threshold, scale)
+
+
+def locate_each_in(frame, template_paths: Sequence[Optional[str]],
+                   threshold: float = 0.8, scale: float = 1.0) -> List[Optional[Tuple[int, int]]]:
+    """Locate several independent templates in one frame; results follow `template_paths` order.
+
+    Matches run concurrently on a shared pool. Falsy paths yield None. `scale` works as in
+    `locate_template_in`.
+    """
+    if frame is None:
+        # pyautogui fallback captures per call; nothing to share
+        return [_pyautogui_locate(p) if p else None for p in template_paths]
+
+    small = _scale_frame(frame, scale)
+
+    def _one(path):
+        return _locate_coarse_fine(frame, small, path, threshold, scale) if path else None
+
+    if len(template_paths) < 2:
+        return [_one(p) for p in template_paths]
+    return list(_MATCH_POOL.map(_one, template_paths))
+
+
+def make_matcher(template_path: str, threshold: float = 0.8):
+    """Return `match(frame) -> (x, y) | None` specialised for one template.
+
+    The template, its alpha mask, its ROI (as registered at this point) and the threshold
+    are bound into the closure, so a tight poll doesn't repeat the cache and registry
+    lookups `locate_template_in` does on every call. A None frame falls back to pyautogui.
+    """
+    tpl = load_template(template_path)
+    if tpl is None:
+        return lambda frame: _pyautogui_locate(template_path)
+    mask = _scaled_mask(template_path, 1.0)
+    th, tw = tpl.shape[:2]
+    x0, y0, x1, y1 = _TEMPLATE_ROIS.get(template_path) or (0, 0, None, None)
+    x0, y0 = max(0, x0), max(0, y0)
+
+    def match(frame) -> Optional[Tuple[int, int]]:
+        if frame is None:
+            return _pyautogui_locate(template_path)
+        view = frame[y0:y1, x0:x1]
+        if th > view.shape[0] or tw > view.shape[1]:
+            return None
+        if mask is None:
+            res = cv2.matchTemplate(view, tpl, cv2.TM_CCOEFF_NORMED)
+        else:
+            res = cv2.matchTemplate(view, tpl, cv2.TM_CCOEFF_NORMED, mask=mask)
+            # same inf/nan cleanup as _match, without its mask-cache lookup
+            res[~np.isfinite(res)] = 0
+        _, max_val, _, max_loc = cv2.minMaxLoc(res)
+        if max_val >= threshold:
+            return (x0 + max_loc[0] + tw // 2, y0 + max_loc[1] + th // 2)
+        return None
+
+    return match
+
+
+def locate_any_on_screen(template_paths: Sequence[Optional[str]], threshold: float = 0.8,
+                         scale: float = 1.0) -> Optional[Tuple[str, int, int]]:
+    """Capture once and return (path, x, y) for the first of `template_paths` on screen.
+
+    Earlier paths win when several are visible; None if none match. Falsy paths are skipped.
+    """
+    for path, loc in zip(template_paths, locate_each_in(grab_frame(), template_paths, threshold, scale)):
+        if loc:
+            return (path, int(loc[0]), int(loc[1]))
+    return None
+
+
+def _pyautogui_locate(template_path: str) -> Optional[Tuple[int, int]]:
+    # fallback to pyautogui.locateCenterOnScreen if available
     if pyautogui is None:
-        return results
+        return None
+    try:
+        loc = pyautogui.locateCenterOnScreen(template_path)
+        return (loc.x, loc.y) if loc else None
+    except Exception:
+        return None
 
-    if cv2 is None:
+
+def locate_on_screen(template_path: str, threshold: float = 0.8) -> Optional[Tuple[int, int]]:
+    """Locate `template_path` on screen. Returns (x,y) center or None.
+
+    Uses OpenCV template matching when `cv2` is installed, else pyautogui.
+    """
+    return locate_template_in(grab_frame(), template_path, threshold)
+
+
+# neighbourhood for the local-maximum test in locate_all_in
+_PEAK_KERNEL = np.ones((30, 30), np.uint8) if np is not None else None
+
+
+def _nms(xs, ys, scores, radius, max_keep):
+    """Indices of the strongest points, skipping any within `radius` px of one already kept."""
+    order = np.argsort(-scores)
+    keep = np.empty(min(max_keep, order.shape[0]), dtype=np.int64)
+    n = 0
+    r2 = radius * radius
+    for i in order:
+        if n >= max_keep:
+            break
+        clear = True
+        for j in range(n):
+            dx = xs[i] - xs[keep[j]]
+            dy = ys[i] - ys[keep[j]]
+            if dx * dx + dy * dy < r2:
+                clear = False
+                break
+        if clear:
+            keep[n] = i
+            n += 1
+    return keep[:n]
+
+
+if njit is not None:
+    # compiled on first use; a plain loop over a few hundred raw hits is otherwise
+    # dominated by per-element numpy scalar overhead
+    _nms = njit(cache=True)(_nms)
+
+
+def wait_for_template(template_path: Optional[str], timeout: float = 2.0, poll: float = 0.1,
+                      stop_event=None, threshold: float = 0.8) -> Optional[Tuple[int, int]]:
+    """Wait until `template_path` is on screen, up to `timeout` seconds; returns its center or None.
+
+    Use instead of fixed settle sleeps after clicks: returns as soon as the next screen's
+    marker appears. Each poll's capture reuses the previous frame's buffer. Gives up
+    early once `stop_event` (a threading.Event) is set.
+    """
+    if not template_path:
+        return None
+    deadline = time.monotonic() + timeout
+    frame = None
+    while True:
+        frame = grab_frame(out=frame)
+        loc = locate_template_in(frame, template_path, threshold)
+        if loc:
+            return loc
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        if stop_event is None:
+            time.sleep(min(poll, remaining))
+        elif stop_event.wait(min(poll, remaining)):
+            return None
+
+
+def locate_all_in(frame, template_path: str, threshold: float = 0.8, debug: bool = False,
+                  max_matches: int = 5) -> list:
+    """Return list of center (x,y) matches for template_path in a frame from `grab_frame()`.
+
+    Deduplicates nearby matches and returns at most `max_matches` candidates. Honors the
+    template's ROI from `set_template_roi`. Falls back to `pyautogui.locateAllOnScreen` when `frame` is None.
+    """
+    results = []
+    if max_matches <= 0:
+        return results
+    if frame is None:
+        if pyautogui is None:
+            return results
         # fallback to pyautogui locateAllOnScreen
         try:
-            boxes = list(pyautogui.locateAllOnScreen(template_path))
-            for b in boxes:
+            for b in pyautogui.locateAllOnScreen(template_path):
                 cx = b.left + b.width // 2
                 cy = b.top + b.height // 2
                 results.append((int(cx), int(cy)))
+                if len(results) >= max_matches:
+                    break
             if debug and results:
                 print(f"[locate_all] pyautogui found {len(results)} matches: {results}")
             return results
@@ -89,39 +509,31 @@ def locate_all_on_screen(template_path: str, threshold: float = 0.8, debug: bool
             return results
 
     try:
-        img = np.array(pyautogui.screenshot())
-        img_gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        tpl = cv2.imread(template_path, cv2.IMREAD_GRAYSCALE)
+        tpl = load_template(template_path)
         if tpl is None:
             if debug:
                 print(f"[locate_all] template not found: {template_path}")
             return results
-        res = cv2.matchTemplate(img_gray, tpl, cv2.TM_CCOEFF_NORMED)
-        locs = list(zip(*np.where(res >= threshold)[::-1]))
+        frame, ox, oy = _crop_roi(frame, template_path)
         th, tw = tpl.shape[:2]
-        
+        if th > frame.shape[0] or tw > frame.shape[1]:
+            return results
+        res = _match(frame, template_path, tpl)
+        # keep only local maxima of the response: every pixel of a match's peak region
+        # passes the threshold, but only the peak equals the 30x30 dilated maximum
+        peaks = (res >= threshold) & (res == cv2.dilate(res, _PEAK_KERNEL))
+        ys, xs = np.where(peaks)
+
         if debug:
-            print(f"[locate_all] template: {template_path}, threshold={threshold}, raw_matches={len(locs)}")
-        
-        # cluster nearby matches using stricter 30-pixel radius to avoid false positives
-        clusters = {}
-        for pt in locs:
-            # get match confidence for this location
-            conf = res[pt[1], pt[0]]
-            cluster_key = (pt[0] // 30, pt[1] // 30)
-            if cluster_key not in clusters or conf > clusters[cluster_key][2]:
-                clusters[cluster_key] = (pt[0], pt[1], conf)
-        
-        # convert cluster centers to actual match centers (add template half-size)
-        for (x, y, conf) in clusters.values():
-            cx = int(x + tw // 2)
-            cy = int(y + th // 2)
-            results.append((cx, cy))
-        
-        # sort by confidence descending and keep top 5
-        if len(results) > 5:
-            results = results[:5]
-        
+            print(f"[locate_all] template: {template_path}, threshold={threshold}, peaks={len(xs)}")
+
+        # suppress peaks within 30 px of a stronger one (plateaus and neighbours across the
+        # dilation window), stopping once `max_matches` are kept; then add the template
+        # half-size to get centers
+        keep = _nms(xs, ys, res[ys, xs], 30, max_matches)
+        for i in keep:
+            results.append((int(ox + xs[i] + tw // 2), int(oy + ys[i] + th // 2)))
+
         if debug:
             print(f"[locate_all] after clustering: {results}")
         return results
@@ -131,6 +543,29 @@ def locate_all_on_screen(template_path: str, threshold: float = 0.8, debug: bool
         return results
 
 
+def locate_all_on_screen(template_path: str, threshold: float = 0.8, debug: bool = False,
+                         max_matches: int = 5) -> list:
+    """Return list of center (x,y) matches for template_path on the screen.
+
+    Uses OpenCV when available to perform template matching and return all
+    matches above `threshold`. Falls back to `pyautogui.locateAllOnScreen`.
+    Deduplicates nearby matches and returns only the strongest candidates.
+    
+    Args:
+        template_path: path to template image
+        threshold: match confidence threshold (0.0-1.0)
+        debug: if True, print debug info about matches
+        max_matches: stop after this many (deduplicated) matches
+    """
+    try:
+        frame = grab_frame()
+    except Exception as e:
+        if debug:
+            print(f"[locate_all] screenshot error: {e}")
+        return []
+    return locate_all_in(frame, template_path, threshold, debug, max_matches)
+
+
 def save_debug_screenshot(output_path: str, template_path: str = None, matches: list = None) -> None:
     """Save a screenshot with template matches marked for visual debugging.
     
@@ -155,11 +590,11 @@ def save_debug_screenshot(output_path: str, template_path: str = None, matches:
         # optionally overlay template match regions if template provided
         if template_path and os.path.exists(template_path):
             try:
-                tpl = cv2.imread(template_path, cv2.IMREAD_GRAYSCALE)
+                tpl = load_template(template_path)
                 if tpl is not None:
                     th, tw = tpl.shape[:2]
                     img_gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-                    res = cv2.matchTemplate(img_gray, tpl, cv2.TM_CCOEFF_NORMED)
+                    res = _match(img_gray, template_path, tpl)
                     # mark top match region with green rectangle
                     _, max_conf, _, max_loc = cv2.minMaxLoc(res)
                     x, y = max_loc
@@ -0,0 +1,59 @@
+"""Template lookup: find a template image by file name anywhere in the repo.
+
+`modules/` is searched first (that's where the images live), then the rest of the
+repo. Results are cached per name, since templates don't move at runtime.
+"""
+from collections import deque
+from typing import Dict, Optional, Tuple
+import functools
+import os
+
+from .screen import set_template_roi
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+_MODULES_DIR = os.path.join(_REPO_ROOT, 'modules')
+
+# directories that never hold templates (hidden dirs are skipped too)
+_SKIP_DIRS = {'venv', '__pycache__', 'node_modules', 'debug'}
+
+
+def _scan_for(root: str, name: str, skip: str = '') -> Optional[str]:
+    """Breadth-first os.scandir search of `root` for file `name`, not descending into `skip`."""
+    pending = deque([root])
+    while pending:
+        try:
+            it = os.scandir(pending.popleft())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.name.startswith('.') or entry.name in _SKIP_DIRS:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.path != skip:
+                        pending.append(entry.path)
+                elif entry.name == name:
+                    return entry.path
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def search_template(name: str) -> Optional[str]:
+    """Return the path of template file `name`, or None if it isn't in the repo."""
+    found = _scan_for(_MODULES_DIR, name)
+    if found:
+        return found
+    # also check repo root (modules/ was already searched)
+    return _scan_for(_REPO_ROOT, name, skip=_MODULES_DIR)
+
+
+def find_template(name: str, rois: Optional[Dict[str, Tuple[int, int, int, int]]] = None) -> Optional[str]:
+    """Like `search_template`, also registering the template's search region from `rois`.
+
+    `rois` maps template file names to fixed (x0, y0, x1, y1) screen regions, see
+    `utils.screen.set_template_roi`.
+    """
+    path = search_template(name)
+    if path and rois and name in rois:
+        set_template_roi(path, rois[name])
+    return path
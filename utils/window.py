@@ -4,214 +4,346 @@ This module uses `win32gui`/`win32con` when available to find a window by title
 or by HWND resolved from a screen point (from image matching). It retries a few
 times to improve robustness and logs progress via the provided `log` callable.
 """
-from typing import Optional
+from typing import Optional, Sequence
 import platform
 import time
 import ctypes
 from ctypes import wintypes
 
-from .screen import locate_on_screen
+from .screen import get_monitor_info, grab_frame, locate_template_in
+
+try:
+    import win32con
+    import win32gui
+except Exception:  # pragma: no cover - optional dependency (pywin32, Windows only)
+    win32con = None
+    win32gui = None
+
+try:
+    _user32 = ctypes.windll.user32
+except Exception:  # not Windows
+    _user32 = None
+
+try:
+    _dwmapi = ctypes.windll.dwmapi
+except Exception:  # not Windows, or DWM unavailable
+    _dwmapi = None
+
+GA_ROOT = 2
+DWMWA_CLOAKED = 14
+HWND_TOP = 0
+HWND_TOPMOST = -1
+SWP_NOSIZE = 0x0001
+SWP_NOMOVE = 0x0002
+SWP_NOACTIVATE = 0x0010
+SWP_SHOWWINDOW = 0x0040
 
 WINDOW_TARGET_WIDTH = 1280
 WINDOW_TARGET_HEIGHT = 720
 
+# last hwnd successfully positioned, per title searched for
+_hwnd_cache = {}
+
+
+# the OS can't change under a running process, so ask once
+_IS_WINDOWS = platform.system().lower() == 'windows'
+
 
 def _is_windows() -> bool:
-    return platform.system().lower() == 'windows'
+    return _IS_WINDOWS
 
 
-def _window_set_pos_win32(hwnd, x: int, y: int, w: int, h: int) -> bool:
+def _window_set_pos_win32(hwnd, x: int, y: int, w: int, h: int, topmost: bool = False) -> bool:
+    # HWND_TOPMOST keeps the window above others; HWND_TOP only brings it to the front
+    after = HWND_TOPMOST if topmost else HWND_TOP
+    flags = SWP_SHOWWINDOW | SWP_NOACTIVATE
+    # already in place: still raise it, but skip the move/resize (and the repaint it triggers)
+    if _window_rect(hwnd) == (int(x), int(y), int(w), int(h)):
+        flags |= SWP_NOMOVE | SWP_NOSIZE
+    if win32gui is not None:
+        try:
+            win32gui.SetWindowPos(hwnd, after, int(x), int(y), int(w), int(h), flags)
+            return True
+        except Exception:
+            pass
+    # Fallback to ctypes SetWindowPos
     try:
-        import win32con
-        import win32gui
-        # Use HWND_TOPMOST to keep the window on top
-        flags = win32con.SWP_SHOWWINDOW
-        win32gui.SetWindowPos(hwnd, win32con.HWND_TOPMOST, int(x), int(y), int(w), int(h), flags)
-        return True
+        return bool(ctypes.windll.user32.SetWindowPos(hwnd, after, int(x), int(y), int(w), int(h), flags))
     except Exception:
-        # Fallback to ctypes SetWindowPos
+        return False
+
+
+def _safe_log(log, msg: str) -> None:
+    if callable(log):
         try:
-            # HWND_TOPMOST = -1, SWP_SHOWWINDOW = 0x0040
-            HWND_TOPMOST = -1
-            SWP_SHOWWINDOW = 0x0040
-            return bool(ctypes.windll.user32.SetWindowPos(hwnd, HWND_TOPMOST, int(x), int(y), int(w), int(h), SWP_SHOWWINDOW))
+            log(msg)
         except Exception:
+            pass
+
+
+def _is_real_window(hwnd) -> bool:
+    """Visible and not cloaked by DWM (hidden UWP/shell surfaces on Win10/11).
+
+    Filters enumeration down to user-facing windows before any title is read. Only
+    meant for EnumWindows results, which are already top-level.
+    """
+    if not win32gui.IsWindowVisible(hwnd):
+        return False
+    if _dwmapi is None:
+        return True
+    try:
+        cloaked = ctypes.c_int(0)
+        if _dwmapi.DwmGetWindowAttribute(hwnd, DWMWA_CLOAKED, ctypes.byref(cloaked),
+                                         ctypes.sizeof(cloaked)) == 0 and cloaked.value:
             return False
+    except Exception:
+        pass
+    return True
 
 
-def _find_hwnd_by_title(title_substr: str):
+def _title_reader():
+    """Return `read(hwnd) -> str` that reuses one text buffer across calls.
+
+    Untitled windows (most shell and tooltip windows) are answered from
+    GetWindowTextLengthW alone, without building a string.
+    """
+    if _user32 is None:
+        return lambda hwnd: win32gui.GetWindowText(hwnd) or ''
+    buf = ctypes.create_unicode_buffer(256)
+
+    def read(hwnd) -> str:
+        nonlocal buf
+        n = _user32.GetWindowTextLengthW(hwnd)
+        if n <= 0:
+            return ''
+        if n >= len(buf):
+            buf = ctypes.create_unicode_buffer(n + 1)
+        _user32.GetWindowTextW(hwnd, buf, len(buf))
+        return buf.value
+
+    return read
+
+
+def _probe_likely_hwnds(title_substr: str, limit: int = 20):
+    """Title-match the foreground window, then the top `limit` windows in Z-order.
+
+    The game is almost always one of these, which saves the full EnumWindows scan.
+    """
+    needle = title_substr.casefold()
     try:
-        import win32gui
+        fg = win32gui.GetForegroundWindow()
+        if fg and needle in (win32gui.GetWindowText(fg) or '').casefold():
+            return fg
+        hwnd = win32gui.GetTopWindow(None)
+        for _ in range(limit):
+            if not hwnd:
+                break
+            if win32gui.IsWindowVisible(hwnd) and needle in (win32gui.GetWindowText(hwnd) or '').casefold():
+                return hwnd
+            hwnd = win32gui.GetWindow(hwnd, win32con.GW_HWNDNEXT)
     except Exception:
-        return None
+        pass
+    return None
+
+
+class _TitleMatcher:
+    """EnumWindows callback that stops at the first real window whose title contains `needle`."""
+    __slots__ = ('needle', 'result', 'read_title')
 
-    result = None
+    def __init__(self, needle: str):
+        self.needle = needle
+        self.result = None
+        self.read_title = _title_reader()
 
-    def _cb(hwnd, _):
-        nonlocal result
-        if not win32gui.IsWindowVisible(hwnd):
+    def __call__(self, hwnd, _):
+        if not _is_real_window(hwnd):
             return True
         try:
-            text = win32gui.GetWindowText(hwnd) or ''
+            text = self.read_title(hwnd)
         except Exception:
             text = ''
-        if title_substr.lower() in text.lower():
-            result = hwnd
+        if text and self.needle in text.casefold():
+            self.result = hwnd
             return False  # stop enumeration
         return True
 
+
+def _find_hwnd_by_title(title_substr: str):
+    if win32gui is None:
+        return None
+
+    # an exact title is a single FindWindow lookup; only enumerate for substring matches
+    try:
+        hwnd = win32gui.FindWindow(None, title_substr)
+        if hwnd and win32gui.IsWindowVisible(hwnd):
+            return hwnd
+    except Exception:
+        pass
+
+    hwnd = _probe_likely_hwnds(title_substr)
+    if hwnd:
+        return hwnd
+
+    matcher = _TitleMatcher(title_substr.casefold())
+    try:
+        win32gui.EnumWindows(matcher, None)
+    except Exception:
+        # pywin32 reports a callback that stopped the enumeration early as an error
+        pass
+    return matcher.result
+
+
+def _window_rect(hwnd):
+    """(x, y, w, h) of `hwnd`, or None if it can't be queried."""
+    try:
+        if win32gui is not None:
+            left, top, right, bottom = win32gui.GetWindowRect(hwnd)
+        else:
+            rect = wintypes.RECT()
+            if not _user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+                return None
+            left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+        return left, top, right - left, bottom - top
+    except Exception:
+        return None
+
+
+def _cached_hwnd(title: str):
+    """The cached hwnd for `title` if it still exists and still carries that title."""
+    hwnd = _hwnd_cache.get(title)
+    if not hwnd:
+        return None
     try:
-        win32gui.EnumWindows(_cb, None)
+        if _user32 is not None and not _user32.IsWindow(hwnd):
+            raise LookupError
+        if title.casefold() not in _title_reader()(hwnd).casefold():
+            raise LookupError
     except Exception:
+        _hwnd_cache.pop(title, None)
         return None
-    return result
+    return hwnd
 
 
 def _hwnd_from_point(x: int, y: int):
     try:
         pt = wintypes.POINT(int(x), int(y))
-        return ctypes.windll.user32.WindowFromPoint(pt)
+        hwnd = ctypes.windll.user32.WindowFromPoint(pt)
+        # WindowFromPoint returns the deepest child under the point; move its top-level window
+        return ctypes.windll.user32.GetAncestor(hwnd, GA_ROOT) if hwnd else None
     except Exception:
         return None
 
 
+def _log_visible_windows(log, limit: int = 30) -> None:
+    """As an aid to debugging, log the titles of the first `limit` real windows."""
+    titles = []
+    read_title = _title_reader()
+
+    def _collect(hwnd, _):
+        if _is_real_window(hwnd):
+            try:
+                txt = read_title(hwnd)
+            except Exception:
+                txt = ''
+            if txt:
+                titles.append(txt)
+        return len(titles) < limit  # stop once the sample is full
+
+    try:
+        win32gui.EnumWindows(_collect, None)
+    except Exception:
+        # also raised when _collect stops the enumeration early
+        pass
+    _safe_log(log, f"[init] visible windows sample: {titles}")
+
+
 def ensure_game_window(log: Optional[callable] = None,
                        title: str = 'Raid: Shadow Legends',
                        template_path: Optional[str] = None,
                        target_w: int = WINDOW_TARGET_WIDTH,
                        target_h: int = WINDOW_TARGET_HEIGHT,
                        retries: int = 5,
-                       retry_delay: float = 0.8) -> bool:
+                       retry_delay: Optional[float] = None,
+                       retry_delays: Sequence[float] = (0.1, 0.25, 0.5, 1.0, 2.0),
+                       debug_on_fail: bool = False,
+                       topmost: bool = False) -> bool:
     """Ensure the game window is at (0,0) sized to target.
 
-    Tries multiple strategies with retries and logs progress.
+    Tries multiple strategies with retries and logs progress. Retries back off through
+    `retry_delays` (the last entry repeats), so a miss caused by a window that is still
+    appearing is retried quickly; passing `retry_delay` keeps a fixed delay instead.
+    `debug_on_fail` logs a sample of visible window titles if every attempt fails, and
+    `topmost=True` keeps the window always-on-top instead of just raising it.
     """
-    if callable(log):
-        try:
-            log("[init] starting window initiation")
-        except Exception:
-            pass
+    if retry_delay is not None:
+        retry_delays = (retry_delay,)
+    _safe_log(log, "[init] starting window initiation")
 
     if not _is_windows():
-        if callable(log):
-            try:
-                log("[init] non-Windows OS; window positioning not supported")
-            except Exception:
-                pass
+        _safe_log(log, "[init] non-Windows OS; window positioning not supported")
         return False
 
+    # the window found last time is usually still there; re-check it before searching
+    hwnd = _cached_hwnd(title)
+    if hwnd:
+        # raised every time (other windows may cover it since); only moved if it drifted
+        if _window_set_pos_win32(hwnd, 0, 0, target_w, target_h, topmost):
+            _safe_log(log, "[init] cached window positioned; initiation complete")
+            return True
+        _hwnd_cache.pop(title, None)
+
     for attempt in range(1, retries + 1):
-        if callable(log):
-            try:
-                log(f"[init] attempt {attempt}/{retries}")
-            except Exception:
-                pass
+        # Wait before retrying
+        if attempt > 1:
+            time.sleep(retry_delays[min(attempt - 2, len(retry_delays) - 1)])
+        _safe_log(log, f"[init] attempt {attempt}/{retries}")
+
+        # Each strategy only proposes a window; every distinct candidate is then moved once
+        candidates = []  # (strategy, hwnd)
 
         # Strategy 1: find by window title substring (fast and reliable if correct)
         try:
             hwnd = _find_hwnd_by_title(title)
             if hwnd:
-                ok = _window_set_pos_win32(hwnd, 0, 0, target_w, target_h)
-                if callable(log):
-                    try:
-                        log(f"[init] title match -> moved={ok}")
-                    except Exception:
-                        pass
-                if ok:
-                    if callable(log):
-                        try:
-                            log("[init] initiation complete")
-                        except Exception:
-                            pass
-                    return True
+                candidates.append(('title match', hwnd))
         except Exception as exc:
-            if callable(log):
-                try:
-                    log(f"[init] title-matching error: {exc}")
-                except Exception:
-                    pass
-
-        # Strategy 2: image/template matching to locate an in-window point
-        if template_path:
-            try:
-                loc = locate_on_screen(template_path)
-                if loc:
-                    x, y = loc
-                    hwnd = _hwnd_from_point(int(x), int(y))
-                    if hwnd:
-                        ok = _window_set_pos_win32(hwnd, 0, 0, target_w, target_h)
-                        if callable(log):
-                            try:
-                                log(f"[init] image match -> moved={ok}")
-                            except Exception:
-                                pass
-                        if ok:
-                            if callable(log):
-                                try:
-                                    log("[init] initiation complete")
-                                except Exception:
-                                    pass
-                            return True
-            except Exception as exc:
-                if callable(log):
-                    try:
-                        log(f"[init] image-matching error: {exc}")
-                    except Exception:
-                        pass
-
-        # Strategy 3: try the center point (useful if game is active fullscreen/windowed)
-        try:
-            import pyautogui
-            sw, sh = pyautogui.size()
-            cx, cy = sw // 2, sh // 2
-            hwnd = _hwnd_from_point(cx, cy)
-            if hwnd:
-                ok = _window_set_pos_win32(hwnd, 0, 0, target_w, target_h)
-                if callable(log):
-                    try:
-                        log(f"[init] center-point -> moved={ok}")
-                    except Exception:
-                        pass
-                if ok:
-                    if callable(log):
-                        try:
-                            log("[init] initiation complete")
-                        except Exception:
-                            pass
-                    return True
-        except Exception:
-            pass
-
-        # Wait before retrying
-        time.sleep(retry_delay)
-
-    if callable(log):
-        try:
-            log("[init] failed to position the game window after retries")
-        except Exception:
-            pass
-    # As an aid to debugging, enumerate visible windows and log a few titles
-    try:
-        import win32gui
-        titles = []
+            _safe_log(log, f"[init] title-matching error: {exc}")
 
-        def _collect(hwnd, _):
-            if win32gui.IsWindowVisible(hwnd):
+        # Strategies 2 and 3 resolve a window from a screen point; when the title already
+        # found the game window they could only add the same window (or a wrong one)
+        if not candidates:
+            # Strategy 2: image/template matching to locate an in-window point. A full-screen
+            # match costs far more than the other strategies, so only run it on the first and
+            # last attempts, at half resolution (hits are confirmed at full resolution)
+            if template_path and attempt in (1, retries):
                 try:
-                    txt = win32gui.GetWindowText(hwnd)
-                except Exception:
-                    txt = ''
-                if txt:
-                    titles.append(txt)
-            return True
+                    loc = locate_template_in(grab_frame(), template_path, scale=0.5)
+                    if loc:
+                        x, y = loc
+                        candidates.append(('image match', _hwnd_from_point(int(x), int(y))))
+                except Exception as exc:
+                    _safe_log(log, f"[init] image-matching error: {exc}")
 
-        win32gui.EnumWindows(_collect, None)
-        sample = titles[:30]
-        if callable(log):
+            # Strategy 3: try the center point (useful if game is active fullscreen/windowed)
             try:
-                log(f"[init] visible windows sample: {sample}")
+                mon = get_monitor_info()
+                candidates.append(('center-point', _hwnd_from_point(mon['width'] // 2, mon['height'] // 2)))
             except Exception:
                 pass
-    except Exception:
-        pass
+
+        tried = set()
+        for strategy, hwnd in candidates:
+            if not hwnd or hwnd in tried:
+                continue
+            tried.add(hwnd)
+            ok = _window_set_pos_win32(hwnd, 0, 0, target_w, target_h, topmost)
+            _safe_log(log, f"[init] {strategy} -> moved={ok}")
+            if ok:
+                _safe_log(log, "[init] initiation complete")
+                _hwnd_cache[title] = hwnd
+                return True
+
+    _safe_log(log, "[init] failed to position the game window after retries")
+    if debug_on_fail:
+        _log_visible_windows(log)
     return False